@@ -1,17 +1,15 @@
 import numpy as np
-import random
 import copy
+import json
 import multiprocessing
+import os
 import time
 import sys
 
-# --- CONSTANTS ---
-ROW_COUNT = 6
-COLUMN_COUNT = 7
-EMPTY = 0
-PLAYER_1_PIECE = 1
-PLAYER_2_PIECE = 2
-WINDOW_LENGTH = 4
+import gameRecords
+import workQueue
+from connect4Core import (PLAYER_1_PIECE, PLAYER_2_PIECE, WEIGHT_KEYS,
+                          get_geometry, play_game, merge_stats, report_adjudication)
 
 # --- GENETIC ALGORITHM SETTINGS ---
 POPULATION_SIZE = 32  # Must be even number
@@ -21,332 +19,358 @@ SEARCH_DEPTH = 7  # RECOMMENDATION: Train at Depth 4, Verify at Depth 7
 
 
 # Depth 7 is too slow for training (hours vs minutes)
+BOARD_GEOMETRY = get_geometry()  # Standard 6x7 connect-4; e.g. get_geometry(7, 8) or get_geometry(6, 7, 5)
 
-# --- GAME ENGINE (HEADLESS & FAST) ---
-def create_board():
-    return np.zeros((ROW_COUNT, COLUMN_COUNT), dtype=int)
-
-
-def drop_piece(board, row, col, piece):
-    board[row][col] = piece
-
-
-def is_valid_location(board, col):
-    return board[ROW_COUNT - 1][col] == 0
-
-
-def get_next_open_row(board, col):
-    # Fast numpy lookup
-    return np.where(board[:, col] == 0)[0][0]
+# --- ADJUDICATION ---
+# Stop a game as soon as a search proves a forced win or a draw, instead of playing it out
+ADJUDICATE = True
+VERIFY_ADJUDICATION = False  # Play adjudicated games out anyway to check the verdict and measure the saving
 
+# --- GAME LOG ---
+GAME_LOG = "ga_games.c4log"  # Every game played is appended here (see gameRecords.py), None to disable
 
-def check_win(board, piece):
-    # Horizontal
-    for c in range(COLUMN_COUNT - 3):
-        for r in range(ROW_COUNT):
-            if board[r][c] == piece and board[r][c + 1] == piece and board[r][c + 2] == piece and board[r][
-                c + 3] == piece:
-                return True
-    # Vertical
-    for c in range(COLUMN_COUNT):
-        for r in range(ROW_COUNT - 3):
-            if board[r][c] == piece and board[r + 1][c] == piece and board[r + 2][c] == piece and board[r + 3][
-                c] == piece:
-                return True
-    # Diagonals
-    for c in range(COLUMN_COUNT - 3):
-        for r in range(ROW_COUNT - 3):
-            if board[r][c] == piece and board[r + 1][c + 1] == piece and board[r + 2][c + 2] == piece and board[r + 3][
-                c + 3] == piece:
-                return True
-    for c in range(COLUMN_COUNT - 3):
-        for r in range(3, ROW_COUNT):
-            if board[r][c] == piece and board[r - 1][c + 1] == piece and board[r - 2][c + 2] == piece and board[r - 3][
-                c + 3] == piece:
-                return True
-    return False
-
-
-def get_valid_locations(board):
-    valid_locations = []
-    for col in range(COLUMN_COUNT):
-        if board[ROW_COUNT - 1][col] == 0:
-            valid_locations.append(col)
-    return valid_locations
-
-
-def is_terminal_node(board):
-    return check_win(board, PLAYER_1_PIECE) or check_win(board, PLAYER_2_PIECE) or len(get_valid_locations(board)) == 0
-
-
-# --- AI LOGIC ---
-def evaluate_window(window, piece, weights):
-    score = 0
-    opp_piece = PLAYER_1_PIECE if piece == PLAYER_2_PIECE else PLAYER_2_PIECE
-
-    my_count = np.count_nonzero(window == piece)
-    empty_count = np.count_nonzero(window == EMPTY)
-    opp_count = np.count_nonzero(window == opp_piece)
-
-    if my_count == 4:
-        score += weights['W_WIN']
-    elif my_count == 3 and empty_count == 1:
-        score += weights['W_THREE']
-    elif my_count == 2 and empty_count == 2:
-        score += weights['W_TWO']
-
-    if opp_count == 3 and empty_count == 1:
-        score -= weights['W_BLOCK']
-
-    return score
-
-
-def score_position(board, piece, weights):
-    score = 0
-
-    # Center Column Score
-    center_array = board[:, COLUMN_COUNT // 2]
-    center_count = np.count_nonzero(center_array == piece)
-    score += center_count * weights['W_CENTER']
-
-    # Horizontal
-    for r in range(ROW_COUNT):
-        row_array = board[r, :]
-        for c in range(COLUMN_COUNT - 3):
-            window = row_array[c:c + WINDOW_LENGTH]
-            score += evaluate_window(window, piece, weights)
-
-    # Vertical
-    for c in range(COLUMN_COUNT):
-        col_array = board[:, c]
-        for r in range(ROW_COUNT - 3):
-            window = col_array[r:r + WINDOW_LENGTH]
-            score += evaluate_window(window, piece, weights)
-
-    # Positive Diagonal
-    for r in range(ROW_COUNT - 3):
-        for c in range(COLUMN_COUNT - 3):
-            window = np.array([board[r + i][c + i] for i in range(WINDOW_LENGTH)])
-            score += evaluate_window(window, piece, weights)
-
-    # Negative Diagonal
-    for r in range(ROW_COUNT - 3):
-        for c in range(COLUMN_COUNT - 3):
-            window = np.array([board[r + 3 - i][c + i] for i in range(WINDOW_LENGTH)])
-            score += evaluate_window(window, piece, weights)
-
-    return score
-
-
-def minimax(board, depth, alpha, beta, maximizingPlayer, piece, weights):
-    valid_locations = get_valid_locations(board)
-    is_terminal = is_terminal_node(board)
-
-    opp_piece = PLAYER_1_PIECE if piece == PLAYER_2_PIECE else PLAYER_2_PIECE
-
-    if depth == 0 or is_terminal:
-        if is_terminal:
-            if check_win(board, piece):
-                return (None, 10000000)
-            elif check_win(board, opp_piece):
-                return (None, -10000000)
-            else:
-                return (None, 0)
-        else:
-            return (None, score_position(board, piece, weights))
-
-    if maximizingPlayer:
-        value = -np.inf
-        column = random.choice(valid_locations)
-        for col in valid_locations:
-            row = get_next_open_row(board, col)
-            b_copy = board.copy()
-            b_copy[row][col] = piece
-            new_score = minimax(b_copy, depth - 1, alpha, beta, False, piece, weights)[1]
-            if new_score > value:
-                value = new_score
-                column = col
-            alpha = max(alpha, value)
-            if alpha >= beta: break
-        return column, value
-    else:
-        value = np.inf
-        column = random.choice(valid_locations)
-        for col in valid_locations:
-            row = get_next_open_row(board, col)
-            b_copy = board.copy()
-            b_copy[row][col] = opp_piece
-            new_score = minimax(b_copy, depth - 1, alpha, beta, True, piece, weights)[1]
-            if new_score < value:
-                value = new_score
-                column = col
-            beta = min(beta, value)
-            if alpha >= beta: break
-        return column, value
+# --- CHECKPOINTS ---
+# After every generation the run state is saved (atomically) so a killed run resumes where it stopped.
+# Run with 'python GAtournament.py restart' to ignore an existing checkpoint.
+CHECKPOINT = "ga_checkpoint.npz"  # None to disable
+RESULTS_LOG = "ga_results.jsonl"  # One JSON line per finished generation, appended, None to disable
+
+# --- DISTRIBUTED EVALUATION ---
+# (host, port) to serve matches to workQueue.py workers on any number of machines instead of
+# playing them in a local Pool, e.g. ('192.168.1.10', workQueue.PORT) for that interface only.
+# Needs the shared key in workQueue.AUTHKEY_ENV. None = this machine's cores only.
+WORK_QUEUE = None
+
+
+def worker_settings():
+    """Settings remote workers need to play exactly the games this process would."""
+    return {'GAtournament': {'SEARCH_DEPTH': SEARCH_DEPTH, 'BOARD_GEOMETRY': BOARD_GEOMETRY,
+                             'ADJUDICATE': ADJUDICATE, 'VERIFY_ADJUDICATION': VERIFY_ADJUDICATION}}
+
+
+# --- GAMES ---
+def play_ga_game(first_weights, second_weights):
+    """
+    Plays one game at the run's settings, first_weights moving first with PLAYER_1_PIECE.
+    Returns: (winning piece or EMPTY for a draw, stats, columns played)
+    """
+    return play_game({PLAYER_1_PIECE: first_weights, PLAYER_2_PIECE: second_weights}, SEARCH_DEPTH,
+                     geometry=BOARD_GEOMETRY, adjudicate_games=ADJUDICATE, verify=VERIFY_ADJUDICATION)
 
 
 # --- WORKER FUNCTION FOR MULTIPROCESSING ---
 def play_match(args):
     """
-    Plays a set of games between two genomes.
-    Returns: (id_1, score_1), (id_2, score_2)
+    Plays a set of games between two genomes, one with each side moving first.
+    Returns: (id_1, score_1), (id_2, score_2), adjudication stats, game records
     """
     g1, g2 = args
     g1_score = 0
     g2_score = 0
+    match_stats = {}
+    records = []
 
     # Game 1: g1 goes first
-    board = create_board()
-    turn = 0
-    while not is_terminal_node(board):
-        if turn == 0:
-            col, _ = minimax(board, SEARCH_DEPTH, -np.inf, np.inf, True, PLAYER_1_PIECE, g1['weights'])
-            row = get_next_open_row(board, col)
-            drop_piece(board, row, col, PLAYER_1_PIECE)
-            if check_win(board, PLAYER_1_PIECE): g1_score += 1; break
-        else:
-            col, _ = minimax(board, SEARCH_DEPTH, -np.inf, np.inf, True, PLAYER_2_PIECE, g2['weights'])
-            row = get_next_open_row(board, col)
-            drop_piece(board, row, col, PLAYER_2_PIECE)
-            if check_win(board, PLAYER_2_PIECE): g2_score += 1; break
-        turn = (turn + 1) % 2
-
-        # Check Draw
-        if len(get_valid_locations(board)) == 0:
-            g1_score += 0.5;
-            g2_score += 0.5;
-            break
+    result, stats, moves = play_ga_game(g1['weights'], g2['weights'])
+    merge_stats(match_stats, stats)
+    records.append(gameRecords.encode_game(moves, g1['id'], g2['id'], SEARCH_DEPTH, gameRecords.NO_SEED, result,
+                                           adjudicated=stats['adjudicated'] and not VERIFY_ADJUDICATION))
+    if result == PLAYER_1_PIECE:
+        g1_score += 1
+    elif result == PLAYER_2_PIECE:
+        g2_score += 1
+    else:
+        g1_score += 0.5
+        g2_score += 0.5
 
     # Game 2: g2 goes first (Swap sides)
-    board = create_board()
-    turn = 1  # Player 2 (who is now g1 playing as P2 piece)
-    while not is_terminal_node(board):
-        if turn == 0:  # g2 is P1
-            col, _ = minimax(board, SEARCH_DEPTH, -np.inf, np.inf, True, PLAYER_1_PIECE, g2['weights'])
-            row = get_next_open_row(board, col)
-            drop_piece(board, row, col, PLAYER_1_PIECE)
-            if check_win(board, PLAYER_1_PIECE): g2_score += 1; break
-        else:  # g1 is P2
-            col, _ = minimax(board, SEARCH_DEPTH, -np.inf, np.inf, True, PLAYER_2_PIECE, g1['weights'])
-            row = get_next_open_row(board, col)
-            drop_piece(board, row, col, PLAYER_2_PIECE)
-            if check_win(board, PLAYER_2_PIECE): g1_score += 1; break
-        turn = (turn + 1) % 2
-        if len(get_valid_locations(board)) == 0:
-            g1_score += 0.5;
-            g2_score += 0.5;
-            break
-
-    return (g1['id'], g1_score), (g2['id'], g2_score)
+    result, stats, moves = play_ga_game(g2['weights'], g1['weights'])
+    merge_stats(match_stats, stats)
+    records.append(gameRecords.encode_game(moves, g2['id'], g1['id'], SEARCH_DEPTH, gameRecords.NO_SEED, result,
+                                           adjudicated=stats['adjudicated'] and not VERIFY_ADJUDICATION))
+    if result == PLAYER_1_PIECE:
+        g2_score += 1
+    elif result == PLAYER_2_PIECE:
+        g1_score += 1
+    else:
+        g1_score += 0.5
+        g2_score += 0.5
+
+    return (g1['id'], g1_score), (g2['id'], g2_score), match_stats, records
 
 
 # --- GENETIC ALGORITHM HELPERS ---
+# The population is one structured array, one row per genome, so ranking,
+# selection and breeding are a handful of array operations at any population size.
+MUTABLE_TRAITS = [0, 2, 3, 4]  # Every weight except W_WIN
+MUTATION_STEPS = np.array([-2, -1, 1, 2, 5, -5])
+CROSSOVER_RATE = 0.5  # Share of children bred from two elites instead of one
+
+GENOME_DTYPE = np.dtype([
+    ('id', np.int64),
+    ('weights', np.int64, (len(WEIGHT_KEYS),)),  # In WEIGHT_KEYS order
+    ('score', np.float64),
+    ('parents', np.int64, (2,)),  # -1 for none
+    ('born', np.int32),  # Generation the genome was created in
+])
+
+rng = np.random.default_rng()
+
+
+def weights_dict(weights):
+    return {key: int(value) for key, value in zip(WEIGHT_KEYS, weights)}
+
+
 def create_initial_population(size):
-    population = []
-    for i in range(size):
-        # Random weights to start
-        weights = {
-            'W_CENTER': random.randint(0, 10),
-            'W_WIN': 100,  # Keep this fixed mostly
-            'W_THREE': random.randint(1, 20),
-            'W_TWO': random.randint(1, 10),
-            'W_BLOCK': random.randint(1, 100)  # Big variance here
-        }
-        population.append({'id': i, 'weights': weights, 'score': 0})
+    population = np.zeros(size, dtype=GENOME_DTYPE)
+    population['id'] = np.arange(size)
+    population['parents'] = -1
+    # Random weights to start
+    weights = population['weights']
+    weights[:, 0] = rng.integers(0, 11, size)  # W_CENTER
+    weights[:, 1] = 100  # W_WIN: keep this fixed mostly
+    weights[:, 2] = rng.integers(1, 21, size)  # W_THREE
+    weights[:, 3] = rng.integers(1, 11, size)  # W_TWO
+    weights[:, 4] = rng.integers(1, 101, size)  # W_BLOCK: big variance here
     return population
 
 
 def mutate(weights):
+    """Mutates one random trait in every row of a (N, len(WEIGHT_KEYS)) weights array."""
     new_weights = weights.copy()
-    # Mutate one random trait
-    trait = random.choice(['W_CENTER', 'W_THREE', 'W_TWO', 'W_BLOCK'])
-    change = random.choice([-2, -1, 1, 2, 5, -5])
-    new_weights[trait] = max(0, new_weights[trait] + change)  # Ensure positive
+    rows = np.arange(len(new_weights))
+    traits = rng.choice(MUTABLE_TRAITS, len(new_weights))
+    changes = rng.choice(MUTATION_STEPS, len(new_weights))
+    new_weights[rows, traits] = np.maximum(0, new_weights[rows, traits] + changes)  # Ensure positive
     return new_weights
 
 
-# --- MAIN DRIVER ---
-# --- UPDATED MAIN DRIVER FOR STABILITY ---
-if __name__ == "__main__":
-    multiprocessing.freeze_support()
+def crossover(weights_a, weights_b):
+    """Uniform crossover: each gene comes from either parent with equal odds."""
+    return np.where(rng.random(weights_a.shape) < 0.5, weights_a, weights_b)
 
-    # SETUP: INCREASED ACCURACY
-    OPPONENTS_PER_GEN = 5  # Each bot plays 5 random opponents now (instead of 1)
-    POPULATION_SIZE = 32  # Keep this size
-    GENERATIONS = 15  # Slightly longer to allow convergence
 
-    print(f"--- GENETIC OPTIMIZATION STARTING ---")
-    print(f"Population: {POPULATION_SIZE} | Depth: {SEARCH_DEPTH} | Cores: {multiprocessing.cpu_count()}")
-    print(f"Strategy: Each bot plays {OPPONENTS_PER_GEN} opponents per generation to reduce luck.")
+def make_matchups(population, rounds):
+    """
+    Every genome plays 'rounds' random opponents.
+    Returns: list of (genome, genome) pairs in the form play_match expects
+    """
+    genomes = [{'id': int(g['id']), 'weights': weights_dict(g['weights'])} for g in population]
+    pairs = np.concatenate([rng.permutation(len(population)).reshape(-1, 2) for _ in range(rounds)])
+    return [(genomes[a], genomes[b]) for a, b in pairs]
 
-    population = create_initial_population(POPULATION_SIZE)
 
-    for gen in range(GENERATIONS):
-        print(f"\nGENERATION {gen + 1}/{GENERATIONS}")
+def update_scores(population, results):
+    """Sets each genome's score to its total over this generation's results."""
+    ids = np.array([[r[0][0], r[1][0]] for r in results]).ravel()
+    scores = np.array([[r[0][1], r[1][1]] for r in results], dtype=float).ravel()
+    sorter = np.argsort(population['id'])
+    rows = sorter[np.searchsorted(population['id'], ids, sorter=sorter)]
+    population['score'] = 0
+    np.add.at(population['score'], rows, scores)
 
-        # 1. Create Matchups (The Gauntlet)
-        # Every bot plays 'OPPONENTS_PER_GEN' random other bots
-        matchups = []
-        indices = list(range(POPULATION_SIZE))
 
-        for _ in range(OPPONENTS_PER_GEN):
-            random.shuffle(indices)
-            # Create pairs from the shuffled list
-            for i in range(0, POPULATION_SIZE, 2):
-                p1 = population[indices[i]]
-                p2 = population[indices[i + 1]]
-                matchups.append((p1, p2))
+def rank(population):
+    return population[np.argsort(-population['score'], kind='stable')]
 
-        # 2. Run Matches in Parallel
-        with multiprocessing.Pool() as pool:
-            results = pool.map(play_match, matchups)
 
-        # 3. Update Scores (Accumulate over all games)
-        score_map = {p['id']: 0 for p in population}
+def next_generation(population, gen, next_id):
+    """
+    The top half survives unchanged (elite preservation) and each elite has one child,
+    a mutated copy or (CROSSOVER_RATE of the time) a mutated cross with another elite.
+    Returns: (new population, next free id)
+    """
+    elites = rank(population)[:len(population) // 2].copy()
+    elites['score'] = 0
+    n = len(elites)
+
+    partners = rng.integers(0, n, n)
+    crossed = rng.random(n) < CROSSOVER_RATE
+    genes = np.where(crossed[:, None], crossover(elites['weights'], elites['weights'][partners]), elites['weights'])
+
+    children = np.zeros(n, dtype=GENOME_DTYPE)
+    children['id'] = next_id + np.arange(n)  # Ids are never reused
+    children['weights'] = mutate(genes)
+    children['parents'][:, 0] = elites['id']
+    children['parents'][:, 1] = np.where(crossed, elites['id'][partners], -1)
+    children['born'] = gen + 1
+    return np.concatenate([elites, children]), next_id + n
 
-        for r in results:
-            (id1, s1), (id2, s2) = r
-            score_map[id1] += s1
-            score_map[id2] += s2
 
-        for p in population:
-            # Update score (resetting previous gen score, keeping only this gen's performance)
-            p['score'] = score_map[p['id']]
+# --- CHECKPOINTS & MATCH CACHE ---
+# Games are deterministic for a given pair of weights, depth and board, so a match
+# between two weight vectors that already met is looked up instead of replayed.
+def genome_key(genome):
+    return tuple(genome['weights'][k] for k in WEIGHT_KEYS)
 
-        # 4. Selection
-        population.sort(key=lambda x: x['score'], reverse=True)
-        top_half = population[:POPULATION_SIZE // 2]
 
-        # Print the "Alpha" of this generation
-        best = top_half[0]
-        print(f"Best Bot: {best['weights']} (Score: {best['score']}/{OPPONENTS_PER_GEN * 2})")
+def match_key(g1, g2):
+    """Cache key for a match: both weight vectors, sorted (a match plays each side first once)."""
+    return tuple(sorted((genome_key(g1), genome_key(g2))))
 
-<<<<<<< HEAD
-        # ... inside the main loop ...
 
-=======
->>>>>>> c5956db919b7a7e8d386c2b2cb36b6562ac47789
-        # 5. Reproduction
-        next_gen = []
-        for parent in top_half:
-            # Elite Preservation (The parent survives unchanged)
-            parent['score'] = 0
-            next_gen.append(parent)
+def oriented(key, g1, scores):
+    """Swaps a pair of scores between g1-first order and the key's order, when they differ."""
+    return scores if genome_key(g1) == key[0] else scores[::-1]
 
-            # Mutation (Child is born)
-            child_weights = mutate(parent['weights'])
 
-            # --- FIX: USE A ROBUST ID GENERATOR ---
-            # We use the length of next_gen + a huge offset based on generation + 1
-            # This guarantees children never share IDs with parents
-            new_id = len(next_gen) + ((gen + 1) * 10000)
+def run_settings():
+    """Settings cached match results depend on."""
+    return {'SEARCH_DEPTH': SEARCH_DEPTH,
+            'BOARD_GEOMETRY': [BOARD_GEOMETRY.rows, BOARD_GEOMETRY.columns, BOARD_GEOMETRY.length]}
 
-            child = {'id': new_id, 'weights': child_weights, 'score': 0}
-            next_gen.append(child)
 
-        population = next_gen
+def save_checkpoint(path, population, generation, next_id, match_cache, log_sizes):
+    """
+    Saves everything needed to carry on after 'generation' generations.
+    log_sizes: {log path: bytes} of the logs written so far, which a resume truncates back to
+    Written to a temporary file and renamed over 'path', so a crash never leaves a half-written checkpoint.
+    """
+    keys = np.array(list(match_cache), dtype=np.int64).reshape(-1, 2, len(WEIGHT_KEYS))
+    scores = np.array(list(match_cache.values()), dtype=np.float64).reshape(-1, 2)
+    tmp = path + ".tmp"
+    with open(tmp, 'wb') as f:
+        np.savez(f, population=population, generation=generation, next_id=next_id,
+                 rng_state=json.dumps(rng.bit_generator.state), settings=json.dumps(run_settings()),
+                 match_keys=keys, match_scores=scores, log_sizes=json.dumps(log_sizes))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path):
+    """
+    Restores the RNG from a checkpoint, and cuts the logs back to their size at the checkpoint:
+    a generation logged after it will be played again. Cached matches are dropped if they
+    were played with a different depth or board.
+    Returns: (population, generations completed, next_id, match cache)
+    """
+    with np.load(path) as data:
+        rng.bit_generator.state = json.loads(str(data['rng_state']))
+        match_cache = {}
+        if json.loads(str(data['settings'])) == run_settings():
+            for key, scores in zip(data['match_keys'].tolist(), data['match_scores'].tolist()):
+                match_cache[tuple(map(tuple, key))] = tuple(scores)
+        for log, size in json.loads(str(data['log_sizes'])).items():
+            if os.path.exists(log) and os.path.getsize(log) > size:
+                with open(log, 'r+b') as f:
+                    f.truncate(size)
+        return data['population'], int(data['generation']), int(data['next_id']), match_cache
+
+
+def log_generation(path, record):
+    with open(path, 'a') as f:
+        f.write(json.dumps(record) + "\n")
+
+
+# --- MAIN DRIVER ---
+# --- UPDATED MAIN DRIVER FOR STABILITY ---
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+
+    # SETUP: INCREASED ACCURACY
+    OPPONENTS_PER_GEN = 5  # Each bot plays 5 random opponents now (instead of 1)
+    POPULATION_SIZE = 32  # Keep this size
+    GENERATIONS = 15  # Slightly longer to allow convergence
+
+    print(f"--- GENETIC OPTIMIZATION STARTING ---")
+    print(f"Population: {POPULATION_SIZE} | Depth: {SEARCH_DEPTH} | Cores: {multiprocessing.cpu_count()}")
+    print(f"Strategy: Each bot plays {OPPONENTS_PER_GEN} opponents per generation to reduce luck.")
+
+    if CHECKPOINT and os.path.exists(CHECKPOINT) and "restart" not in sys.argv[1:]:
+        population, start_gen, next_id, match_cache = load_checkpoint(CHECKPOINT)
+        print(f"Resuming from {CHECKPOINT} after generation {start_gen} "
+              f"({len(population)} bots, {len(match_cache)} cached matches)")
+    else:
+        population = create_initial_population(POPULATION_SIZE)
+        start_gen, next_id, match_cache = 0, POPULATION_SIZE, {}
+    game_log = gameRecords.GameLog(GAME_LOG, BOARD_GEOMETRY.rows, BOARD_GEOMETRY.columns,
+                                   BOARD_GEOMETRY.length) if GAME_LOG else None
+
+    if WORK_QUEUE is None:
+        evaluator = multiprocessing.Pool()
+    else:
+        try:
+            authkey = workQueue.authkey_from_env()
+        except ValueError as e:
+            sys.exit(str(e))
+        evaluator = workQueue.Coordinator(WORK_QUEUE, authkey, worker_settings())
+        print(f"Serving matches on port {evaluator.address[1]}. "
+              f"Start workers with: python workQueue.py <this host> {evaluator.address[1]}")
+
+    with evaluator as pool:
+        for gen in range(start_gen, GENERATIONS):
+            print(f"\nGENERATION {gen + 1}/{GENERATIONS}")
+            gen_start = time.perf_counter()
+
+            # 1. Create Matchups (The Gauntlet)
+            # Every bot plays 'OPPONENTS_PER_GEN' random other bots
+            matchups = make_matchups(population, OPPONENTS_PER_GEN)
+
+            # 2. Run Matches in Parallel (pairs that already met are looked up instead)
+            keys = [match_key(g1, g2) for g1, g2 in matchups]
+            new_matches = {}
+            for key, matchup in zip(keys, matchups):
+                if key not in match_cache:
+                    new_matches.setdefault(key, matchup)
+            games_start = time.perf_counter()
+            played = pool.map(play_match, list(new_matches.values()))
+            games_time = time.perf_counter() - games_start
+            for (key, (g1, _)), r in zip(new_matches.items(), played):
+                match_cache[key] = oriented(key, g1, (r[0][1], r[1][1]))
+
+            # 3. Update Scores (only this generation's performance counts)
+            results = []
+            for key, (g1, g2) in zip(keys, matchups):
+                s1, s2 = oriented(key, g1, match_cache[key])
+                results.append(((g1['id'], s1), (g2['id'], s2)))
+            update_scores(population, results)
+
+            gen_stats = {}
+            for r in played:
+                merge_stats(gen_stats, r[2])
+                if game_log is not None:
+                    game_log.extend(r[3])
+            if game_log is not None:
+                game_log.flush()
+
+            if ADJUDICATE:
+                report_adjudication(gen_stats, VERIFY_ADJUDICATION)
+
+            # 4. Selection
+            population = rank(population)
+
+            # Print the "Alpha" of this generation
+            best = population[0]
+            print(f"Best Bot: {weights_dict(best['weights'])} (Score: {best['score']:g}/{OPPONENTS_PER_GEN * 2})")
+            if RESULTS_LOG:
+                log_generation(RESULTS_LOG, {
+                    'generation': gen + 1, 'time': time.time(), 'games_time': round(games_time, 3),
+                    'matches': len(matchups), 'cached_matches': len(matchups) - len(played),
+                    'adjudication': gen_stats,
+                    'population': [{'id': int(g['id']), 'weights': weights_dict(g['weights']),
+                                    'score': float(g['score']), 'parents': g['parents'].tolist(),
+                                    'born': int(g['born'])} for g in population]})
+
+            # 5. Reproduction
+            population, next_id = next_generation(population, gen, next_id)
+            if CHECKPOINT:
+                logs = [log for log in (GAME_LOG, RESULTS_LOG) if log and os.path.exists(log)]
+                save_checkpoint(CHECKPOINT, population, gen + 1, next_id, match_cache,
+                                {log: os.path.getsize(log) for log in logs})
+
+            total_time = time.perf_counter() - gen_start
+            print(f"Time: {games_time:.1f}s in games ({len(played)}/{len(matchups)} matches played, "
+                  f"the rest cached), {total_time - games_time:.3f}s bookkeeping")
+            if WORK_QUEUE is not None:
+                queue_stats = pool.stats()
+                print(f"Workers: {queue_stats['active_workers']} | Jobs retried: {queue_stats['retried']}")
+
+    if game_log is not None:
+        game_log.close()
 
     print("\n--- OPTIMIZATION COMPLETE ---")
     print("Top 3 Converged Configurations:")
+    # The elites come first in the final population, best first
     for i in range(3):
-        print(f"#{i + 1}: {population[i]['weights']}")
\ No newline at end of file
+        print(f"#{i + 1}: {weights_dict(population[i]['weights'])}")
@@ -0,0 +1,108 @@
+import importlib
+import multiprocessing
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+# --- SETTINGS ---
+# Startup costs that every pool worker pays before its first game.
+# Run with: python benchmark.py
+REPEATS = 5
+MODULES = ["numpy", "connect4Core", "gameRecords", "tournament", "GAtournament", "connect4Engine"]
+WORKER_MODULES = ["connect4Core", "GAtournament"]  # What a GA pool worker has to import
+POOL_SIZE = max(2, multiprocessing.cpu_count())
+
+# How search cost scales with the board: (rows, columns, win length)
+GEOMETRIES = [(6, 7, 4), (7, 8, 4), (8, 9, 4), (6, 7, 5)]
+SEARCH_DEPTH = 5
+SEARCH_POSITIONS = 8  # Random openings searched per geometry (same seed every run)
+SEARCH_WEIGHTS = {'W_CENTER': 3, 'W_WIN': 100, 'W_THREE': 1, 'W_TWO': 8, 'W_BLOCK': 29}
+
+
+# --- IMPORT TIME ---
+def import_time(module):
+    """Median wall time of 'import module' in a fresh interpreter, minus the interpreter's own startup."""
+    def run(code):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True, stdout=subprocess.DEVNULL,
+                       env=dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1"))
+        return time.perf_counter() - start
+
+    base = statistics.median(run("pass") for _ in range(REPEATS))
+    return statistics.median(run(f"import {module}") for _ in range(REPEATS)) - base
+
+
+# --- WORKER SPAWN TIME ---
+def _load(module):
+    importlib.import_module(module)
+
+
+def _ready(_):
+    time.sleep(0.05)  # Hold each worker long enough that every worker gets a task
+    return os.getpid()
+
+
+def pool_startup_time(method, module):
+    """
+    Wall time from creating a pool until every worker has imported 'module' and answered.
+    Returns: (seconds, workers that answered)
+    """
+    context = multiprocessing.get_context(method)
+    start = time.perf_counter()
+    with context.Pool(POOL_SIZE, initializer=_load, initargs=(module,)) as pool:
+        pids = set(pool.map(_ready, range(POOL_SIZE), chunksize=1))
+        elapsed = time.perf_counter() - start
+    return elapsed, len(pids)
+
+
+# --- SEARCH THROUGHPUT ---
+def search_throughput(rows, columns, length, depth=SEARCH_DEPTH, positions=SEARCH_POSITIONS):
+    """
+    Builds the geometry's tables, then searches a fixed set of random openings to 'depth'.
+    Returns: (table build seconds, nodes searched, search CPU seconds)
+    """
+    import connect4Core  # Not at the top: forked pool workers above would inherit it for free
+    start = time.perf_counter()
+    geometry = connect4Core.Geometry(rows, columns, length)
+    geometry.eval_table(connect4Core.PLAYER_1_PIECE, SEARCH_WEIGHTS)
+    build = time.perf_counter() - start
+
+    rng = random.Random(0)
+    boards = []
+    while len(boards) < positions:
+        board = connect4Core.create_board(geometry)
+        piece = connect4Core.PLAYER_1_PIECE
+        for _ in range(rng.randint(0, 2 * columns)):
+            col = rng.choice(connect4Core.get_valid_locations(board))
+            connect4Core.drop_piece(board, connect4Core.get_next_open_row(board, col), col, piece)
+            piece = 3 - piece
+        if not connect4Core.is_terminal_node(board, geometry):
+            boards.append((board, piece))
+
+    connect4Core.search_stats['nodes'] = 0
+    start = time.process_time()
+    for board, piece in boards:
+        connect4Core.search(board, depth, piece, SEARCH_WEIGHTS, geometry)
+    return build, connect4Core.search_stats['nodes'], time.process_time() - start
+
+
+if __name__ == "__main__":
+    print("--- IMPORT TIME (fresh interpreter) ---")
+    for module in MODULES:
+        print(f"{module:<16} {import_time(module) * 1000:7.1f} ms")
+
+    print(f"\n--- POOL STARTUP ({POOL_SIZE} workers) ---")
+    methods = [m for m in ("fork", "forkserver", "spawn") if m in multiprocessing.get_all_start_methods()]
+    for module in WORKER_MODULES:
+        for method in methods:
+            elapsed, workers = pool_startup_time(method, module)
+            print(f"{module:<16} {method:<11} {elapsed * 1000:7.1f} ms ({workers} workers answered)")
+
+    print(f"\n--- SEARCH BY GEOMETRY (depth {SEARCH_DEPTH}, {SEARCH_POSITIONS} positions) ---")
+    for rows, columns, length in GEOMETRIES:
+        build, nodes, cpu = search_throughput(rows, columns, length)
+        print(f"{rows}x{columns} connect-{length}  tables {build * 1000:6.1f} ms  "
+              f"{nodes:8d} nodes  {cpu:6.2f} s  {nodes / cpu / 1000:6.1f} knodes/s")
@@ -0,0 +1,409 @@
+import functools
+import time
+
+import numpy as np
+
+# Headless Connect 4 engine shared by the GUI, the tournament and the GA.
+# No pygame and nothing runs at import time, so pool workers and benchmarks
+# can import it cheaply. The AI is parameterised by a weights dict:
+# {'W_CENTER', 'W_WIN', 'W_THREE', 'W_TWO', 'W_BLOCK'} -> number.
+# The board size and win length are runtime parameters (see Geometry); the constants
+# below are the standard game, used whenever no geometry is given.
+
+# --- CONSTANTS ---
+ROW_COUNT = 6
+COLUMN_COUNT = 7
+EMPTY = 0
+PLAYER_1_PIECE = 1
+PLAYER_2_PIECE = 2
+WINDOW_LENGTH = 4  # Pieces in a row needed to win
+
+WEIGHT_KEYS = ['W_CENTER', 'W_WIN', 'W_THREE', 'W_TWO', 'W_BLOCK']
+
+# --- SEARCH SETTINGS ---
+WIN_SCORE = 10000000
+ASPIRATION_WINDOW = 50  # Half-width of the window around the previous depth's score
+search_stats = {'nodes': 0}  # Nodes visited by negamax, for benchmarking
+BRANCHING_ESTIMATE = 4  # Growth in search time per extra ply, for time-budgeted searches
+TABLE_CACHE_SIZE = 4096  # Evaluation tables kept per geometry, one per (piece, weights)
+
+
+# --- GEOMETRY ---
+class Geometry:
+    """
+    Lookup tables for one board size and win length, generated once (see get_geometry).
+    Cells are numbered row-major from the bottom left: r * columns + c, as in board.ravel().
+    """
+
+    def __init__(self, rows, columns, length):
+        if length < 2 or length > max(rows, columns):
+            raise ValueError(f"No line of {length} fits on a {rows}x{columns} board")
+        self.rows = rows
+        self.columns = columns
+        self.length = length
+        self.cells = rows * columns
+
+        # Every window of 'length' cells, in the order score_position has always scored them
+        windows = []
+        for r in range(rows):
+            for c in range(columns - length + 1):
+                windows.append([r * columns + c + i for i in range(length)])
+        for c in range(columns):
+            for r in range(rows - length + 1):
+                windows.append([(r + i) * columns + c for i in range(length)])
+        for r in range(rows - length + 1):
+            for c in range(columns - length + 1):
+                windows.append([(r + i) * columns + c + i for i in range(length)])
+        for r in range(rows - length + 1):
+            for c in range(columns - length + 1):
+                windows.append([(r + length - 1 - i) * columns + c + i for i in range(length)])
+        self.windows = np.array(windows, dtype=np.int64).reshape(len(windows), length)
+        self.powers = 3 ** np.arange(length, dtype=np.int64)  # A window's cells read as a base-3 number
+        self.center = np.arange(rows) * columns + columns // 2
+        # Center columns first: they are usually strongest, so cutoffs come sooner
+        self.move_order = tuple(sorted(range(columns), key=lambda c: abs(columns // 2 - c)))
+
+        # Bitboards: column-major, rows + 1 bits per column so a line never wraps into the next column
+        self.cell_bits = [1 << ((i % columns) * (rows + 1) + i // columns) for i in range(self.cells)]
+        self.win_masks = [sum(self.cell_bits[i] for i in window) for window in windows]
+        self.masks_through = [tuple(m for window, m in zip(windows, self.win_masks) if i in window)
+                              for i in range(self.cells)]
+        self.tables = {}
+
+    def __repr__(self):
+        return f"Geometry({self.rows}, {self.columns}, {self.length})"
+
+    def eval_table(self, piece, weights):
+        """
+        evaluate_window for every possible window, indexed by its base-3 code.
+        Returns: array of 3 ** length scores (cached per piece and weights)
+        """
+        key = (piece, tuple(weights[k] for k in WEIGHT_KEYS))
+        table = self.tables.get(key)
+        if table is None:
+            codes = np.arange(3 ** self.length)[:, None] // self.powers % 3
+            table = np.array([evaluate_window(window, piece, weights) for window in codes.tolist()])
+            if len(self.tables) >= TABLE_CACHE_SIZE:
+                self.tables.clear()
+            self.tables[key] = table
+        return table
+
+    def score(self, cells, piece, weights):
+        """score_position for a flat int64 array of cells."""
+        table = self.eval_table(piece, weights)
+        score = table[cells[self.windows] @ self.powers].sum()
+        return (score + np.count_nonzero(cells[self.center] == piece) * weights['W_CENTER']).item()
+
+
+@functools.lru_cache(maxsize=None)
+def get_geometry(rows=ROW_COUNT, columns=COLUMN_COUNT, length=WINDOW_LENGTH):
+    return Geometry(rows, columns, length)
+
+
+def board_geometry(board, geometry=None):
+    """The given geometry, or the one for the board's shape with the standard win length."""
+    if geometry is not None:
+        return geometry
+    return get_geometry(board.shape[0], board.shape[1])
+
+
+# --- BOARD & MOVE GENERATION ---
+def create_board(geometry=None):
+    if geometry is None:
+        return np.zeros((ROW_COUNT, COLUMN_COUNT), dtype=int)
+    return np.zeros((geometry.rows, geometry.columns), dtype=int)
+
+
+def drop_piece(board, row, col, piece):
+    board[row][col] = piece
+
+
+def is_valid_location(board, col):
+    return board[-1][col] == 0
+
+
+def get_next_open_row(board, col):
+    for r in range(board.shape[0]):
+        if board[r][col] == 0:
+            return r
+
+
+def winning_move(board, piece, geometry=None):
+    g = board_geometry(board, geometry)
+    cells = np.asarray(board).ravel()
+    return bool(np.any(np.all(cells[g.windows] == piece, axis=1)))
+
+
+def is_terminal_node(board, geometry=None):
+    return winning_move(board, PLAYER_1_PIECE, geometry) or winning_move(board, PLAYER_2_PIECE, geometry) or len(
+        get_valid_locations(board)) == 0
+
+
+def get_valid_locations(board):
+    valid_locations = []
+    for col in range(board.shape[1]):
+        if is_valid_location(board, col):
+            valid_locations.append(col)
+    return valid_locations
+
+
+# --- EVALUATION ---
+def evaluate_window(window, piece, weights):
+    score = 0
+    opp_piece = PLAYER_1_PIECE
+    if piece == PLAYER_1_PIECE:
+        opp_piece = PLAYER_2_PIECE
+    length = len(window)
+
+    # Use the passed 'weights' dictionary
+    if window.count(piece) == length:
+        score += weights['W_WIN']
+    elif window.count(piece) == length - 1 and window.count(EMPTY) == 1:
+        score += weights['W_THREE']
+    elif window.count(piece) == length - 2 and window.count(EMPTY) == 2:
+        score += weights['W_TWO']
+
+    if window.count(opp_piece) == length - 1 and window.count(EMPTY) == 1:
+        score -= weights['W_BLOCK']
+
+    return score
+
+
+def score_position(board, piece, weights, geometry=None):
+    # Center column plus evaluate_window over every window, looked up by window code
+    g = board_geometry(board, geometry)
+    return g.score(np.asarray(board, dtype=np.int64).ravel(), piece, weights)
+
+
+# --- SEARCH ---
+class Search:
+    """
+    Search state for one root position: the board as flat cells (for evaluation)
+    and one bitboard per piece (for win checks), updated in place as moves are made and unmade.
+    """
+
+    def __init__(self, board, piece, weights, geometry=None):
+        g = self.geometry = board_geometry(board, geometry)
+        self.piece = piece
+        self.opp_piece = PLAYER_1_PIECE if piece == PLAYER_2_PIECE else PLAYER_2_PIECE
+        self.table = g.eval_table(piece, weights)
+        self.w_center = weights['W_CENTER']
+        self.cells = np.asarray(board, dtype=np.int64).ravel().copy()
+        self.heights = [int(np.count_nonzero(board[:, c])) for c in range(g.columns)]
+        self.empty = int(np.count_nonzero(self.cells == EMPTY))
+        self.bits = [0, 0, 0]  # Indexed by piece
+        for i in np.flatnonzero(self.cells):
+            self.bits[self.cells[i]] |= g.cell_bits[i]
+
+        # Later nodes only need to check the last mover; the root has to check both sides
+        if winning_move(board, piece, g):
+            self.root_value = WIN_SCORE
+        elif winning_move(board, self.opp_piece, g):
+            self.root_value = -WIN_SCORE
+        elif self.empty == 0:
+            self.root_value = 0
+        else:
+            self.root_value = None
+
+    def evaluate(self):
+        g = self.geometry
+        score = self.table[self.cells[g.windows] @ g.powers].sum()
+        return (score + np.count_nonzero(self.cells[g.center] == self.piece) * self.w_center).item()
+
+    def negamax(self, depth, alpha, beta, color, last_cell=None, last_piece=None):
+        """
+        Negamax alpha-beta with principal variation search.
+        color is +1 when 'piece' is to move and -1 when the opponent is.
+        last_cell/last_piece: the move that led here (None at the root).
+        Returns: (column, score for the side to move)
+        """
+        search_stats['nodes'] += 1
+        g = self.geometry
+
+        if last_cell is None:
+            if self.root_value is not None:
+                return (None, color * self.root_value)
+        else:
+            # Only the side that just moved can have completed a line
+            bits = self.bits[last_piece]
+            for mask in g.masks_through[last_cell]:
+                if bits & mask == mask:
+                    return (None, color * (WIN_SCORE if last_piece == self.piece else -WIN_SCORE))
+            if self.empty == 0:
+                return (None, 0)
+        if depth == 0:
+            return (None, color * self.evaluate())
+
+        mover = self.piece if color == 1 else self.opp_piece
+        cells, heights, bits = self.cells, self.heights, self.bits
+        value = -np.inf
+        column = None
+        for col in g.move_order:
+            row = heights[col]
+            if row == g.rows:
+                continue
+            cell = row * g.columns + col
+            cells[cell] = mover
+            heights[col] = row + 1
+            bits[mover] ^= g.cell_bits[cell]
+            self.empty -= 1
+            if column is None:
+                new_score = -self.negamax(depth - 1, -beta, -alpha, -color, cell, mover)[1]
+            else:
+                # Null window: only prove this move is no better than the best so far
+                new_score = -self.negamax(depth - 1, -alpha - 1, -alpha, -color, cell, mover)[1]
+                if alpha < new_score < beta:
+                    new_score = -self.negamax(depth - 1, -beta, -alpha, -color, cell, mover)[1]
+            self.empty += 1
+            bits[mover] ^= g.cell_bits[cell]
+            heights[col] = row
+            cells[cell] = EMPTY
+            if column is None or new_score > value:
+                value = new_score
+                column = col
+            alpha = max(alpha, value)
+            if alpha >= beta: break
+        return column, value
+
+
+def negamax(board, depth, alpha, beta, color, piece, weights, geometry=None):
+    """Single negamax search of 'board'. Returns (column, score for the side to move)."""
+    return Search(board, piece, weights, geometry).negamax(depth, alpha, beta, color)
+
+
+def iterate_search(board, depth, piece, weights, geometry=None):
+    """
+    Iterative deepening driver for negamax.
+    Each depth is searched in an aspiration window around the previous depth's score
+    and widened to the failing side if the result falls outside it.
+    Yields: (depth, column, value) after every completed depth
+    """
+    state = Search(board, piece, weights, geometry)
+    column, value = state.negamax(1, -np.inf, np.inf, 1)
+    yield 1, column, value
+    for d in range(2, depth + 1):
+        alpha, beta = value - ASPIRATION_WINDOW, value + ASPIRATION_WINDOW
+        while True:
+            column, value = state.negamax(d, alpha, beta, 1)
+            if value <= alpha:
+                alpha = -np.inf
+            elif value >= beta:
+                beta = np.inf
+            else:
+                break
+        yield d, column, value
+
+
+def search(board, depth, piece, weights, geometry=None):
+    for _, column, value in iterate_search(board, depth, piece, weights, geometry):
+        pass
+    return column, value
+
+
+def timed_search(board, max_depth, piece, weights, time_budget, geometry=None):
+    """
+    Deepens until max_depth, or until the next depth would likely overrun time_budget (seconds).
+    Returns: (column, value, depth reached)
+    """
+    start = time.perf_counter()
+    last = start
+    for d, column, value in iterate_search(board, max_depth, piece, weights, geometry):
+        now = time.perf_counter()
+        # Each extra ply costs roughly BRANCHING_ESTIMATE times the previous one
+        if now - start + (now - last) * BRANCHING_ESTIMATE > time_budget:
+            break
+        last = now
+    return column, value, d
+
+
+# --- ADJUDICATION ---
+def adjudicate(board, value, piece, depth):
+    """
+    Result proven by a 'depth' search that returned 'value' for 'piece' to move.
+    Returns the winning piece, EMPTY for a proven draw, or None if the game is still open.
+    """
+    opp_piece = PLAYER_1_PIECE if piece == PLAYER_2_PIECE else PLAYER_2_PIECE
+    if value >= WIN_SCORE:
+        return piece
+    if value <= -WIN_SCORE:
+        return opp_piece
+    # Every line reached a full board, so a score of 0 is exact
+    if value == 0 and np.count_nonzero(board == EMPTY) <= depth:
+        return EMPTY
+    return None
+
+
+def merge_stats(total, stats):
+    for key, value in stats.items():
+        total[key] = total.get(key, 0) + value
+    return total
+
+
+def report_adjudication(stats, verify=False):
+    if not stats:
+        return
+    kind = "measured" if verify else "estimated"
+    print(f"Adjudicated {stats['adjudicated']}/{stats['games']} games | "
+          f"Saved ({kind}): {stats['plies_saved']} plies, {stats['cpu_saved']:.1f}s CPU "
+          f"(spent {stats['cpu']:.1f}s)")
+    if verify:
+        print(f"Adjudication check: {stats['mismatches']} outcome mismatches vs full play")
+
+
+# --- GAMES ---
+def play_game(weights, depth, first_piece=PLAYER_1_PIECE, geometry=None, move_fn=None,
+              adjudicate_games=True, verify=False):
+    """
+    Plays one game, 'weights' mapping each piece to its weights dict and first_piece moving first.
+    move_fn(board, piece, weights) -> (column, value) picks the moves; by default a 'depth' search.
+    With adjudicate_games on, the game is scored as soon as a search proves the result;
+    with verify on as well, it is played out anyway to check the verdict and measure the saving.
+    Returns: (winning piece or EMPTY for a draw, stats, columns played)
+    """
+    geometry = geometry or get_geometry()
+    if move_fn is None:
+        def move_fn(board, piece, piece_weights):
+            return search(board, depth, piece, piece_weights, geometry)
+    board = create_board(geometry)
+    piece = first_piece
+    stats = {'games': 1, 'adjudicated': 0, 'plies': 0, 'plies_saved': 0,
+             'cpu': 0.0, 'cpu_saved': 0.0, 'mismatches': 0}
+    moves = []
+    verdict = None
+    start = time.process_time()
+
+    while True:
+        search_start = time.process_time()
+        col, value = move_fn(board, piece, weights[piece])
+        if adjudicate_games and verdict is None:
+            verdict = adjudicate(board, value, piece, depth)
+            if verdict is not None:
+                stats['adjudicated'] = 1
+                verdict_ply, verdict_cpu = stats['plies'], time.process_time() - start
+                if not verify:
+                    # Estimate: a proven result ends within the search horizon (or when the board fills),
+                    # and searches only get cheaper from here, so price each ply like the last one
+                    stats['plies_saved'] = min(int(np.count_nonzero(board == EMPTY)), depth)
+                    stats['cpu'] = verdict_cpu
+                    stats['cpu_saved'] = stats['plies_saved'] * (time.process_time() - search_start)
+                    return verdict, stats, moves
+
+        row = get_next_open_row(board, col)
+        drop_piece(board, row, col, piece)
+        moves.append(col)
+        stats['plies'] += 1
+        if winning_move(board, piece, geometry):
+            result = piece
+            break
+        if len(get_valid_locations(board)) == 0:
+            result = EMPTY
+            break
+        piece = PLAYER_1_PIECE if piece == PLAYER_2_PIECE else PLAYER_2_PIECE
+
+    stats['cpu'] = time.process_time() - start
+    if verdict is not None:
+        # Played on past the verdict: measure the real saving and check the outcome
+        stats['plies_saved'] = stats['plies'] - verdict_ply
+        stats['cpu_saved'] = stats['cpu'] - verdict_cpu
+        stats['mismatches'] = int(verdict != result)
+    return result, stats, moves
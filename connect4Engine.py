@@ -3,6 +3,13 @@ import pygame
 import sys
 import math
 import random
+import threading
+
+import gameRecords
+import moveServer
+from connect4Core import (ROW_COUNT, COLUMN_COUNT, PLAYER_1_PIECE, PLAYER_2_PIECE,
+                          create_board, drop_piece, is_valid_location, get_next_open_row,
+                          winning_move, search)
 
 # --- CONFIGURATION & CONSTANTS ---
 BLUE = (0, 0, 255)
@@ -10,17 +17,11 @@ BLACK = (0, 0, 0)
 RED = (255, 0, 0)
 YELLOW = (255, 255, 0)
 
-ROW_COUNT = 6
-COLUMN_COUNT = 7
-
 PLAYER = 0
 AI = 1
 
-EMPTY = 0
-PLAYER_PIECE = 1
-AI_PIECE = 2
-
-WINDOW_LENGTH = 4
+PLAYER_PIECE = PLAYER_1_PIECE
+AI_PIECE = PLAYER_2_PIECE
 
 # --- OPTIMIZATION WEIGHTS (HYPERPARAMETERS) ---
 # Adjust these numbers to change the AI's personality!
@@ -33,6 +34,17 @@ W_TWO = 8          # Value of getting 2-in-a-row
 # DEFENSE WEIGHT: How much it hates the opponent getting 3-in-a-row
 W_BLOCK = 29
 
+AI_WEIGHTS = {'W_CENTER': W_CENTER, 'W_WIN': W_WIN, 'W_THREE': W_THREE, 'W_TWO': W_TWO, 'W_BLOCK': W_BLOCK}
+
+AI_DEPTH = 7  # Depth 5 is good for a strong challenge but reasonably fast
+
+# Finished games are appended here (see gameRecords.py), None to disable
+GAME_LOG = "gui_games.c4log"
+
+# (host, port) of a running moveServer.py to ask for the AI's moves, None to search in-process
+MOVE_SERVER = None
+AI_TIME_BUDGET = None  # Seconds per AI move when using the move server, None for full depth
+
 # --- PYGAME SETUP ---
 SQUARESIZE = 100
 width = COLUMN_COUNT * SQUARESIZE
@@ -40,270 +52,195 @@ height = (ROW_COUNT + 1) * SQUARESIZE
 size = (width, height)
 RADIUS = int(SQUARESIZE / 2 - 5)
 
+FPS = 60  # Frame cap: the loop sleeps between frames instead of spinning
+DROP_ACCELERATION = 5000  # Pixels/s^2 for the falling piece animation
+GAME_OVER_WAIT = 7000  # Milliseconds to show the result before closing
 
-# --- GAME LOGIC FUNCTIONS ---
-def create_board():
-    board = np.zeros((ROW_COUNT, COLUMN_COUNT))
-    return board
-
-
-def drop_piece(board, row, col, piece):
-    board[row][col] = piece
-
-
-def is_valid_location(board, col):
-    return board[ROW_COUNT - 1][col] == 0
-
-
-def get_next_open_row(board, col):
-    for r in range(ROW_COUNT):
-        if board[r][col] == 0:
-            return r
+PIECE_COLORS = {PLAYER_PIECE: RED, AI_PIECE: YELLOW}
 
 
 def print_board(board):
     print(np.flip(board, 0))
 
 
-def winning_move(board, piece):
-    # Check horizontal locations for win
-    for c in range(COLUMN_COUNT - 3):
-        for r in range(ROW_COUNT):
-            if board[r][c] == piece and board[r][c + 1] == piece and board[r][c + 2] == piece and board[r][
-                c + 3] == piece:
-                return True
+# --- RENDERING ---
+# The blue board is drawn once into a surface with see-through holes. Each frame
+# only redraws what changed (a column, the hover strip) and updates just those rects.
+def piece_center(row, col):
+    return int(col * SQUARESIZE + SQUARESIZE / 2), height - int(row * SQUARESIZE + SQUARESIZE / 2)
 
-    # Check vertical locations for win
-    for c in range(COLUMN_COUNT):
-        for r in range(ROW_COUNT - 3):
-            if board[r][c] == piece and board[r + 1][c] == piece and board[r + 2][c] == piece and board[r + 3][
-                c] == piece:
-                return True
-
-    # Check positively sloped diaganols
-    for c in range(COLUMN_COUNT - 3):
-        for r in range(ROW_COUNT - 3):
-            if board[r][c] == piece and board[r + 1][c + 1] == piece and board[r + 2][c + 2] == piece and board[r + 3][
-                c + 3] == piece:
-                return True
-
-    # Check negatively sloped diaganols
-    for c in range(COLUMN_COUNT - 3):
-        for r in range(3, ROW_COUNT):
-            if board[r][c] == piece and board[r - 1][c + 1] == piece and board[r - 2][c + 2] == piece and board[r - 3][
-                c + 3] == piece:
-                return True
-
-
-# --- OPTIMIZATION ENGINE (AI) ---
-def evaluate_window(window, piece):
-    score = 0
-    opp_piece = PLAYER_PIECE
-    if piece == PLAYER_PIECE:
-        opp_piece = AI_PIECE
-
-    # OFFENSE: Check for our connections
-    if window.count(piece) == 4:
-        score += W_WIN
-    elif window.count(piece) == 3 and window.count(EMPTY) == 1:
-        score += W_THREE
-    elif window.count(piece) == 2 and window.count(EMPTY) == 2:
-        score += W_TWO
-
-    # DEFENSE: Check for opponent connections
-    if window.count(opp_piece) == 3 and window.count(EMPTY) == 1:
-        score -= W_BLOCK  # Subtract points (penalize letting opponent get 3)
-
-    return score
-
-
-def score_position(board, piece):
-    score = 0
-
-    # Score Center Column
-    center_array = [int(i) for i in list(board[:, COLUMN_COUNT // 2])]
-    center_count = center_array.count(piece)
-    score += center_count * W_CENTER # Uses the variable now
-
-    # Score Horizontal
-    for r in range(ROW_COUNT):
-        row_array = [int(i) for i in list(board[r, :])]
-        for c in range(COLUMN_COUNT - 3):
-            window = row_array[c:c + WINDOW_LENGTH]
-            score += evaluate_window(window, piece)
 
-    # Score Vertical
-    for c in range(COLUMN_COUNT):
-        col_array = [int(i) for i in list(board[:, c])]
-        for r in range(ROW_COUNT - 3):
-            window = col_array[r:r + WINDOW_LENGTH]
-            score += evaluate_window(window, piece)
-
-    # Score Positive Sloped Diagonal
-    for r in range(ROW_COUNT - 3):
-        for c in range(COLUMN_COUNT - 3):
-            window = [board[r + i][c + i] for i in range(WINDOW_LENGTH)]
-            score += evaluate_window(window, piece)
-
-    for r in range(ROW_COUNT - 3):
-        for c in range(COLUMN_COUNT - 3):
-            window = [board[r + 3 - i][c + i] for i in range(WINDOW_LENGTH)]
-            score += evaluate_window(window, piece)
-
-    return score
-
-
-def is_terminal_node(board):
-    return winning_move(board, PLAYER_PIECE) or winning_move(board, AI_PIECE) or len(get_valid_locations(board)) == 0
-
-
-def get_valid_locations(board):
-    valid_locations = []
-    for col in range(COLUMN_COUNT):
-        if is_valid_location(board, col):
-            valid_locations.append(col)
-    return valid_locations
-
-
-def minimax(board, depth, alpha, beta, maximizingPlayer):
-    valid_locations = get_valid_locations(board)
-    is_terminal = is_terminal_node(board)
-
-    if depth == 0 or is_terminal:
-        if is_terminal:
-            if winning_move(board, AI_PIECE):
-                return (None, 100000000000000)
-            elif winning_move(board, PLAYER_PIECE):
-                return (None, -10000000000000)
-            else:  # Game is over, no more valid moves
-                return (None, 0)
-        else:  # Depth is zero
-            return (None, score_position(board, AI_PIECE))
-
-    if maximizingPlayer:
-        value = -math.inf
-        column = random.choice(valid_locations)
-        for col in valid_locations:
-            row = get_next_open_row(board, col)
-            b_copy = board.copy()
-            drop_piece(b_copy, row, col, AI_PIECE)
-            new_score = minimax(b_copy, depth - 1, alpha, beta, False)[1]
-            if new_score > value:
-                value = new_score
-                column = col
-            alpha = max(alpha, value)
-            if alpha >= beta:
-                break
-        return column, value
-
-    else:  # Minimizing player
-        value = math.inf
-        column = random.choice(valid_locations)
-        for col in valid_locations:
-            row = get_next_open_row(board, col)
-            b_copy = board.copy()
-            drop_piece(b_copy, row, col, PLAYER_PIECE)
-            new_score = minimax(b_copy, depth - 1, alpha, beta, True)[1]
-            if new_score < value:
-                value = new_score
-                column = col
-            beta = min(beta, value)
-            if alpha >= beta:
-                break
-        return column, value
-
-
-def draw_board(board):
+def make_board_surface():
+    surface = pygame.Surface((width, height - SQUARESIZE)).convert()
+    surface.fill(BLUE)
     for c in range(COLUMN_COUNT):
         for r in range(ROW_COUNT):
-            # Draw the blue square
-            pygame.draw.rect(screen, BLUE, (c * SQUARESIZE, r * SQUARESIZE + SQUARESIZE, SQUARESIZE, SQUARESIZE))
-            # Draw the empty black circle
-            pygame.draw.circle(screen, BLACK, (int(c * SQUARESIZE + SQUARESIZE / 2),
-                                               int(r * SQUARESIZE + SQUARESIZE + SQUARESIZE / 2)), RADIUS)
+            pygame.draw.circle(surface, BLACK, (int(c * SQUARESIZE + SQUARESIZE / 2),
+                                                int(r * SQUARESIZE + SQUARESIZE / 2)), RADIUS)
+    surface.set_colorkey(BLACK)
+    return surface
+
+
+def draw_column(screen, board_surface, board, col, falling=None):
+    """
+    Redraws one column, from the top of the window down: pieces, an optional
+    falling (piece, y), then the board over them.
+    Returns: the rect to update
+    """
+    rect = pygame.Rect(col * SQUARESIZE, 0, SQUARESIZE, height)
+    screen.fill(BLACK, rect)
+    for r in range(ROW_COUNT):
+        if board[r][col] in PIECE_COLORS:
+            pygame.draw.circle(screen, PIECE_COLORS[board[r][col]], piece_center(r, col), RADIUS)
+    if falling is not None:
+        piece, y = falling
+        pygame.draw.circle(screen, PIECE_COLORS[piece], (int(col * SQUARESIZE + SQUARESIZE / 2), int(y)), RADIUS)
+    screen.blit(board_surface, (col * SQUARESIZE, SQUARESIZE),
+                pygame.Rect(col * SQUARESIZE, 0, SQUARESIZE, height - SQUARESIZE))
+    return rect
 
+
+def draw_board(screen, board_surface, board):
     for c in range(COLUMN_COUNT):
-        for r in range(ROW_COUNT):
-            # Draw Player pieces (Red)
-            if board[r][c] == PLAYER_PIECE:
-                pygame.draw.circle(screen, RED, (int(c * SQUARESIZE + SQUARESIZE / 2),
-                                                 height - int(r * SQUARESIZE + SQUARESIZE / 2)), RADIUS)
-            # Draw AI pieces (Yellow)
-            elif board[r][c] == AI_PIECE:
-                pygame.draw.circle(screen, YELLOW, (int(c * SQUARESIZE + SQUARESIZE / 2),
-                                                    height - int(r * SQUARESIZE + SQUARESIZE / 2)), RADIUS)
-    pygame.display.update()
+        draw_column(screen, board_surface, board, c)
+    return screen.get_rect()
+
+
+def draw_strip(screen, posx=None, label=None):
+    """Top strip: the result label, or the player's piece hovering at posx."""
+    rect = pygame.Rect(0, 0, width, SQUARESIZE)
+    screen.fill(BLACK, rect)
+    if label is not None:
+        screen.blit(label, (40, 10))
+    elif posx is not None:
+        pygame.draw.circle(screen, RED, (posx, int(SQUARESIZE / 2)), RADIUS)
+    return rect
+
+
+# --- AI ---
+def think(board, move_client, result):
+    # Runs on a worker thread so the window stays responsive while the AI searches
+    if move_client is not None:
+        try:
+            result['move'] = move_client.best_move(board, AI_PIECE, AI_WEIGHTS, AI_DEPTH, AI_TIME_BUDGET)
+            return
+        except (RuntimeError, OSError, ValueError) as e:
+            # Server error or lost connection: search locally rather than never moving
+            print(f"Move server unavailable ({e}), searching locally")
+    result['move'] = search(board, AI_DEPTH, AI_PIECE, AI_WEIGHTS)
+
+
+def record_game(moves, first_turn, winner_turn, seed):
+    if not GAME_LOG:
+        return
+    ids = {PLAYER: gameRecords.HUMAN_ID, AI: gameRecords.weights_id(AI_WEIGHTS)}
+    # Records count the first mover as player 1, winner_turn None is a draw
+    result = 0 if winner_turn is None else (1 if winner_turn == first_turn else 2)
+    gameRecords.append_games(GAME_LOG, [gameRecords.encode_game(moves, ids[first_turn], ids[1 - first_turn],
+                                                                AI_DEPTH, seed, result)],
+                             ROW_COUNT, COLUMN_COUNT)
 
 
 # --- MAIN EXECUTION ---
-board = create_board()
-print_board(board)
-game_over = False
-turn = random.randint(PLAYER, AI)
-
-pygame.init()
-screen = pygame.display.set_mode(size)
-draw_board(board)
-pygame.display.update()
-pygame.display.set_caption("Connect 4 - Optimization Project")
-
-myfont = pygame.font.SysFont("monospace", 75)
-
-while not game_over:
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            sys.exit()
-
-        if event.type == pygame.MOUSEMOTION:
-            pygame.draw.rect(screen, BLACK, (0, 0, width, SQUARESIZE))
-            posx = event.pos[0]
-            if turn == PLAYER:
-                pygame.draw.circle(screen, RED, (posx, int(SQUARESIZE / 2)), RADIUS)
-            pygame.display.update()
-
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            pygame.draw.rect(screen, BLACK, (0, 0, width, SQUARESIZE))
-            # Player 1 Input
-            if turn == PLAYER:
-                posx = event.pos[0]
-                col = int(math.floor(posx / SQUARESIZE))
-
-                if is_valid_location(board, col):
-                    row = get_next_open_row(board, col)
-                    drop_piece(board, row, col, PLAYER_PIECE)
-
-                    if winning_move(board, PLAYER_PIECE):
-                        label = myfont.render("Player 1 Wins!!", 1, RED)
-                        screen.blit(label, (40, 10))
-                        game_over = True
+def main():
+    board = create_board()
+    print_board(board)
+    seed = random.getrandbits(32)  # Recorded with the game
+    turn = random.Random(seed).randint(PLAYER, AI)
+    first_turn = turn
+    moves = []
+
+    pygame.init()
+    screen = pygame.display.set_mode(size)
+    pygame.display.set_caption("Connect 4 - Optimization Project")
+    board_surface = make_board_surface()
+    draw_strip(screen)
+    draw_board(screen, board_surface, board)
+    pygame.display.update()
 
-                    turn += 1
-                    turn = turn % 2
+    myfont = pygame.font.SysFont("monospace", 75)
+    move_client = moveServer.MoveClient(*MOVE_SERVER) if MOVE_SERVER else None
+    clock = pygame.time.Clock()
 
-                    draw_board(board)
+    posx = None
+    strip_dirty = False
+    falling = None  # Piece being animated: {'piece', 'col', 'row', 'y', 'speed'}
+    thinking = None  # Filled with 'move' by the AI thread
+    label = None
+    game_over_at = None
 
-    # # AI Input (runs automatically if it is AI turn)
-    if turn == AI and not game_over:
-        # Depth 5 is good for a strong challenge but reasonably fast
-        col, minimax_score = minimax(board, 7, -math.inf, math.inf, True)
+    while game_over_at is None or pygame.time.get_ticks() - game_over_at < GAME_OVER_WAIT:
+        dt = min(clock.tick(FPS) / 1000, 0.05)
+        dirty = []
 
-        if is_valid_location(board, col):
-            # Optional: Add small delay so it doesn't feel instant
-            pygame.time.wait(500)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                sys.exit()
 
-            row = get_next_open_row(board, col)
-            drop_piece(board, row, col, AI_PIECE)
+            if event.type == pygame.MOUSEMOTION:
+                posx = event.pos[0]
+                # Never clear a pending redraw (e.g. the result label) just because the mouse moved
+                strip_dirty = strip_dirty or turn == PLAYER
+
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                # Player 1 Input
+                if turn == PLAYER and falling is None and label is None:
+                    col = int(math.floor(event.pos[0] / SQUARESIZE))
+                    if is_valid_location(board, col):
+                        falling = {'piece': PLAYER_PIECE, 'col': col, 'row': get_next_open_row(board, col),
+                                   'y': SQUARESIZE / 2, 'speed': 0}
+                        strip_dirty = True
+
+        # AI Input (runs automatically if it is AI turn)
+        if turn == AI and falling is None and label is None:
+            if thinking is None:
+                thinking = {}
+                threading.Thread(target=think, args=(board.copy(), move_client, thinking), daemon=True).start()
+            elif 'move' in thinking:
+                col, minimax_score = thinking['move']
+                thinking = None
+                if col is not None and is_valid_location(board, col):
+                    # The drop animation replaces the old fixed delay before the AI's move
+                    falling = {'piece': AI_PIECE, 'col': col, 'row': get_next_open_row(board, col),
+                               'y': SQUARESIZE / 2, 'speed': 0}
+
+        if strip_dirty:
+            dirty.append(draw_strip(screen, posx if turn == PLAYER and falling is None else None, label))
+            strip_dirty = False
+
+        if falling is not None:
+            piece, col, row = falling['piece'], falling['col'], falling['row']
+            falling['speed'] += DROP_ACCELERATION * dt
+            falling['y'] += falling['speed'] * dt
+            if falling['y'] < piece_center(row, col)[1]:
+                dirty.append(draw_column(screen, board_surface, board, col, (piece, falling['y'])))
+            else:
+                # Landed
+                falling = None
+                drop_piece(board, row, col, piece)
+                moves.append(col)
+                dirty.append(draw_column(screen, board_surface, board, col))
+
+                winner = PLAYER if piece == PLAYER_PIECE else AI
+                if winning_move(board, piece):
+                    if winner == PLAYER:
+                        label = myfont.render("Player 1 Wins!!", 1, RED)
+                    else:
+                        label = myfont.render("AI Wins!!", 1, YELLOW)
+                    record_game(moves, first_turn, winner, seed)
+                    game_over_at = pygame.time.get_ticks()
+                elif not any(is_valid_location(board, c) for c in range(COLUMN_COUNT)):
+                    label = myfont.render("Draw!", 1, BLUE)
+                    record_game(moves, first_turn, None, seed)
+                    game_over_at = pygame.time.get_ticks()
 
-            if winning_move(board, AI_PIECE):
-                label = myfont.render("AI Wins!!", 1, YELLOW)
-                screen.blit(label, (40, 10))
-                game_over = True
+                turn += 1
+                turn = turn % 2
+                strip_dirty = True
 
-            draw_board(board)
+        if dirty:
+            pygame.display.update(dirty)
 
-            turn += 1
-            turn = turn % 2
 
-    if game_over:
-        pygame.time.wait(7000)  # Wait 3 seconds before closing
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+import mmap
+import os
+import struct
+import zlib
+
+import numpy as np
+
+# --- FORMAT ---
+# File:   FILE_HEADER, then records back to back, appended as games finish.
+# Record: RECORD_HEADER, then one byte per ply (the column played).
+# The first mover always plays piece 1, so 'result' is 1 (first mover won),
+# 2 (second mover won) or 0 (draw).
+MAGIC = b'C4GR'
+VERSION = 2
+FILE_HEADER = struct.Struct('<4sBBBB')  # magic, version, rows, columns, win length
+FILE_HEADER_V1 = struct.Struct('<4sBBB')  # Version 1 had no win length: always 4
+RECORD_HEADER = struct.Struct('<BBBBiiI')  # plies, result, depth, flags, first_id, second_id, seed
+
+FLAG_ADJUDICATED = 1  # Game was stopped early, the last moves are missing
+
+HUMAN_ID = -1  # Id used for the human side of GUI games
+NO_SEED = 0  # Seed of games that draw no random numbers (searches are deterministic), e.g. the GA's
+
+
+def weights_id(weights):
+    """Stable id for a weights dict, for bots that have no id of their own."""
+    key = ','.join(f"{k}={weights[k]}" for k in sorted(weights))
+    return zlib.crc32(key.encode()) & 0x7FFFFFFF
+
+
+def encode_game(moves, first_id, second_id, depth, seed, result, adjudicated=False):
+    """
+    Packs one game into a record.
+    moves: sequence of columns in play order
+    """
+    flags = FLAG_ADJUDICATED if adjudicated else 0
+    return RECORD_HEADER.pack(len(moves), result, depth, flags, first_id, second_id, seed) + bytes(moves)
+
+
+class GameRecord:
+    __slots__ = ('moves', 'result', 'depth', 'flags', 'first_id', 'second_id', 'seed')
+
+    def __init__(self, moves, result, depth, flags, first_id, second_id, seed):
+        self.moves = moves  # bytes, one column per ply
+        self.result = result
+        self.depth = depth
+        self.flags = flags
+        self.first_id = first_id
+        self.second_id = second_id
+        self.seed = seed
+
+    @property
+    def adjudicated(self):
+        return bool(self.flags & FLAG_ADJUDICATED)
+
+
+# --- WRITING ---
+class GameLog:
+    """
+    Append-only writer for a game log.
+    Creates the file (and its header) on first use, and refuses to mix board geometries.
+    """
+
+    def __init__(self, path, rows=6, columns=7, length=4):
+        self.path = path
+        self.rows = rows
+        self.columns = columns
+        self.length = length
+        self.file = None
+
+    def open(self):
+        if self.file is None:
+            if os.path.exists(self.path) and os.path.getsize(self.path) >= FILE_HEADER.size:
+                with open(self.path, 'rb') as f:
+                    _, rows, columns, length, _ = read_file_header(f.read(FILE_HEADER.size))
+                if (rows, columns, length) != (self.rows, self.columns, self.length):
+                    raise ValueError(f"{self.path} holds {rows}x{columns} connect-{length} games, "
+                                     f"not {self.rows}x{self.columns} connect-{self.length}")
+                # Drop a record cut short by a crash, or new records would be read as part of it
+                end = complete_length(self.path)
+                if end < os.path.getsize(self.path):
+                    with open(self.path, 'r+b') as f:
+                        f.truncate(end)
+                self.file = open(self.path, 'ab')
+            else:
+                # New, or cut short by a crash while its header was being written: start it over
+                self.file = open(self.path, 'wb')
+                self.file.write(FILE_HEADER.pack(MAGIC, VERSION, self.rows, self.columns, self.length))
+        return self
+
+    def append(self, record):
+        self.open().file.write(record)
+
+    def extend(self, records):
+        self.open()
+        for record in records:
+            self.file.write(record)
+
+    def flush(self):
+        if self.file is not None:
+            self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def append_games(path, records, rows=6, columns=7, length=4):
+    with GameLog(path, rows, columns, length) as log:
+        log.extend(records)
+
+
+# --- READING ---
+def read_file_header(data):
+    """
+    Parses the header at the start of 'data' (version 1 or 2).
+    Returns: (version, rows, columns, win length, header size)
+    """
+    magic, version, rows, columns = FILE_HEADER_V1.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a game log")
+    if version == 1:
+        return version, rows, columns, 4, FILE_HEADER_V1.size
+    if version != VERSION:
+        raise ValueError(f"Unsupported game log version {version}")
+    length = FILE_HEADER.unpack_from(data)[4]
+    return version, rows, columns, length, FILE_HEADER.size
+
+
+def read_geometry(path):
+    """Returns: (rows, columns, win length) of the games in the log"""
+    with open(path, 'rb') as f:
+        _, rows, columns, length, _ = read_file_header(f.read(FILE_HEADER.size))
+    return rows, columns, length
+
+
+def complete_length(path):
+    """Bytes from the start of the log to the end of its last complete record."""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        offset = read_file_header(data[:FILE_HEADER.size])[4]
+        end = len(data)
+        while offset + RECORD_HEADER.size <= end:
+            plies = data[offset]  # First field of RECORD_HEADER
+            if offset + RECORD_HEADER.size + plies > end:
+                break
+            offset += RECORD_HEADER.size + plies
+    return offset
+
+
+def read_games(path):
+    """
+    Yields every GameRecord in the log.
+    The file is memory-mapped, so only the pages being read are resident.
+    A record cut short by a crash at the end of the file is ignored.
+    """
+    if os.path.getsize(path) <= FILE_HEADER_V1.size:
+        return
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        offset = read_file_header(data[:FILE_HEADER.size])[4]
+        end = len(data)
+        while offset + RECORD_HEADER.size <= end:
+            plies, result, depth, flags, first_id, second_id, seed = RECORD_HEADER.unpack_from(data, offset)
+            offset += RECORD_HEADER.size
+            if offset + plies > end:
+                break
+            moves = data[offset:offset + plies]
+            offset += plies
+            yield GameRecord(moves, result, depth, flags, first_id, second_id, seed)
+
+
+def iter_positions(path):
+    """
+    Replays every game in the log.
+    Yields: (board, piece to move, column played, game record) for each ply
+    'board' is one array updated in place (rows counted from the bottom, as in the engine),
+    so copy it if you want to keep it.
+    """
+    rows, columns, _ = read_geometry(path)
+    board = np.zeros((rows, columns), dtype=np.int8)
+    heights = np.zeros(columns, dtype=np.int64)
+    for game in read_games(path):
+        board[:] = 0
+        heights[:] = 0
+        piece = 1
+        for col in game.moves:
+            yield board, piece, col, game
+            board[heights[col], col] = piece
+            heights[col] += 1
+            piece = 3 - piece
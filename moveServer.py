@@ -0,0 +1,258 @@
+import collections
+import json
+import queue
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+import numpy as np
+
+from connect4Core import ROW_COUNT, COLUMN_COUNT, PLAYER_1_PIECE, PLAYER_2_PIECE, WEIGHT_KEYS, timed_search
+
+# --- SETTINGS ---
+# One warm engine process answering best-move queries for any number of local clients
+# (GUI sessions, tournaments, scripts). Start it with: python moveServer.py [port]
+HOST = "127.0.0.1"
+PORT = 5004
+BATCH_WINDOW = 0.002  # Seconds to wait for more requests before working through a batch
+CACHE_SIZE = 200000  # Search results kept (least recently used are dropped first)
+LATENCY_SAMPLES = 10000  # Recent requests used for the latency percentiles
+MAX_DEPTH = 12  # Deeper requests are searched to this depth, so one client cannot hold the engine for hours
+
+# --- PROTOCOL ---
+# Newline-delimited JSON over TCP, one request/response pair per line.
+# Move request:  {"board": "<ROW_COUNT*COLUMN_COUNT digits, bottom row first>", "piece": 2,
+#                 "weights": {...}, "depth": 7, "time": 1.5}   ("time" is optional, in seconds)
+# Move response: {"column": 3, "score": 12, "depth": 7, "cached": false, "ms": 41.2}
+#                ("depth" is the depth searched: at most MAX_DEPTH and the number of empty cells)
+# Stats request: {"stats": true}
+
+
+def encode_board(board):
+    return ''.join(str(int(v)) for v in np.asarray(board).ravel())
+
+
+def decode_board(text):
+    return np.array([int(c) for c in text], dtype=int).reshape(ROW_COUNT, COLUMN_COUNT)
+
+
+def validate_request(board, piece, weights, depth, time_budget):
+    """Returns: a description of what is wrong with a move request, or None if it can be searched"""
+    if not isinstance(board, str) or len(board) != ROW_COUNT * COLUMN_COUNT or set(board) - set('012'):
+        return f"board must be {ROW_COUNT * COLUMN_COUNT} digits 0-2"
+    if piece not in (PLAYER_1_PIECE, PLAYER_2_PIECE):
+        return f"piece must be {PLAYER_1_PIECE} or {PLAYER_2_PIECE}"
+    if not isinstance(weights, dict) or any(
+            isinstance(weights.get(k), bool) or not isinstance(weights.get(k), (int, float)) for k in WEIGHT_KEYS):
+        return f"weights must give a number for each of {', '.join(WEIGHT_KEYS)}"
+    if depth < 1:
+        return "depth must be at least 1"
+    if time_budget is not None and (isinstance(time_budget, bool) or not isinstance(time_budget, (int, float))
+                                    or time_budget <= 0):
+        return "time must be a positive number of seconds"
+    return None
+
+
+# --- SERVER ---
+class Request:
+    __slots__ = ('key', 'time_budget', 'received', 'done', 'response')
+
+    def __init__(self, key, time_budget):
+        self.key = key
+        self.time_budget = time_budget
+        self.received = time.perf_counter()
+        self.done = threading.Event()
+        self.response = None
+
+
+class MoveEngine:
+    """
+    Single search thread behind a request queue.
+    Requests arriving together are taken as one batch, identical positions in a batch
+    are searched once, and finished searches are cached across clients.
+    """
+
+    def __init__(self):
+        self.requests = queue.Queue()
+        self.cache = collections.OrderedDict()  # key -> (column, score, depth, time budget used)
+        self.latencies = collections.deque(maxlen=LATENCY_SAMPLES)
+        self.counters = {'requests': 0, 'searches': 0, 'cache_hits': 0, 'deduplicated': 0,
+                         'batches': 0, 'max_queue_depth': 0, 'errors': 0}
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def submit(self, board, piece, weights, depth, time_budget=None):
+        error = validate_request(board, piece, weights, depth, time_budget)
+        if error is not None:
+            return {'error': error}
+        # Lines never run past a full board, so deeper than the empty cells gives the same answer
+        depth = max(1, min(depth, MAX_DEPTH, board.count('0')))
+        key = (board, piece, tuple(weights[k] for k in WEIGHT_KEYS), depth)
+        request = Request(key, time_budget)
+        self.requests.put(request)
+        with self.lock:
+            self.counters['requests'] += 1
+            self.counters['max_queue_depth'] = max(self.counters['max_queue_depth'], self.requests.qsize())
+        request.done.wait()
+        return request.response
+
+    def lookup(self, key, time_budget):
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        column, score, depth, budget = entry
+        # A full-depth result answers anything; a cut-short one only requests with no more time
+        if depth >= key[3] or (time_budget is not None and budget is not None and budget >= time_budget):
+            self.cache.move_to_end(key)
+            return entry
+        return None
+
+    def run(self):
+        while True:
+            batch = [self.requests.get()]
+            time.sleep(BATCH_WINDOW)
+            while True:
+                try:
+                    batch.append(self.requests.get_nowait())
+                except queue.Empty:
+                    break
+
+            groups = collections.OrderedDict()
+            for request in batch:
+                groups.setdefault(request.key, []).append(request)
+            with self.lock:
+                self.counters['batches'] += 1
+                self.counters['deduplicated'] += len(batch) - len(groups)
+
+            for key, waiting in groups.items():
+                # The most generous budget in the group answers all of them
+                budgets = [r.time_budget for r in waiting]
+                time_budget = None if None in budgets else max(budgets)
+                try:
+                    entry = self.lookup(key, time_budget)
+                    cached = entry is not None
+                    if not cached:
+                        entry = self.compute(key, time_budget)
+                except Exception as e:
+                    # Answer this group with the error and keep serving everyone else
+                    self.fail(waiting, f"{type(e).__name__}: {e}")
+                    continue
+                self.finish(waiting, entry, cached)
+
+    def compute(self, key, time_budget):
+        board, piece, weights, depth = key
+        weights = dict(zip(WEIGHT_KEYS, weights))
+        column, score, reached = timed_search(decode_board(board), depth, piece, weights,
+                                              np.inf if time_budget is None else time_budget)
+        entry = (column, float(score), reached, time_budget)
+        self.cache[key] = entry
+        if len(self.cache) > CACHE_SIZE:
+            self.cache.popitem(last=False)
+        with self.lock:
+            self.counters['searches'] += 1
+        return entry
+
+    def finish(self, waiting, entry, cached):
+        column, score, depth, _ = entry
+        now = time.perf_counter()
+        with self.lock:
+            if cached:
+                self.counters['cache_hits'] += len(waiting)
+            for request in waiting:
+                latency = now - request.received
+                self.latencies.append(latency)
+                request.response = {'column': None if column is None else int(column), 'score': score,
+                                    'depth': depth, 'cached': cached, 'ms': round(latency * 1000, 3)}
+                request.done.set()
+
+    def fail(self, waiting, error):
+        with self.lock:
+            self.counters['errors'] += len(waiting)
+        for request in waiting:
+            request.response = {'error': error}
+            request.done.set()
+
+    def stats(self):
+        with self.lock:
+            stats = dict(self.counters)
+            latencies = np.array(self.latencies) * 1000
+        stats['queue_depth'] = self.requests.qsize()
+        stats['cache_size'] = len(self.cache)
+        if len(latencies):
+            for p in (50, 90, 99):
+                stats[f'p{p}_ms'] = round(float(np.percentile(latencies, p)), 3)
+        return stats
+
+
+class MoveRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        engine = self.server.engine
+        for line in self.rfile:
+            try:
+                message = json.loads(line)
+                if not isinstance(message, dict):
+                    response = {'error': "request must be a JSON object"}
+                elif message.get('stats'):
+                    response = engine.stats()
+                else:
+                    response = engine.submit(message['board'], int(message['piece']), message['weights'],
+                                             int(message['depth']), message.get('time'))
+            except (ValueError, KeyError, TypeError) as e:
+                response = {'error': str(e)}
+            self.wfile.write(json.dumps(response).encode() + b'\n')
+
+
+class MoveServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address=(HOST, PORT)):
+        super().__init__(address, MoveRequestHandler)
+        self.engine = MoveEngine()
+
+
+# --- CLIENT ---
+class MoveClient:
+    """
+    Connection to a running move server. Not thread-safe: use one client per thread.
+    """
+
+    def __init__(self, host=HOST, port=PORT, timeout=None):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.file = self.sock.makefile('rwb')
+
+    def request(self, message):
+        self.file.write(json.dumps(message).encode() + b'\n')
+        self.file.flush()
+        response = json.loads(self.file.readline())
+        if 'error' in response:
+            raise RuntimeError(f"Move server error: {response['error']}")
+        return response
+
+    def best_move(self, board, piece, weights, depth, time_budget=None):
+        """Same result as connect4Core.search(board, depth, piece, weights) when time allows."""
+        message = {'board': encode_board(board), 'piece': piece, 'weights': weights, 'depth': depth}
+        if time_budget is not None:
+            message['time'] = time_budget
+        response = self.request(message)
+        return response['column'], response['score']
+
+    def stats(self):
+        return self.request({'stats': True})
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else PORT
+    with MoveServer((HOST, port)) as server:
+        print(f"Move server listening on {HOST}:{port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print(json.dumps(server.engine.stats(), indent=2))
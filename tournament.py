@@ -1,21 +1,42 @@
-import numpy as np
+import math
 import random
 import copy
 import sys
 
-# --- CONSTANTS ---
-ROW_COUNT = 6
-COLUMN_COUNT = 7
-EMPTY = 0
-PLAYER_1_PIECE = 1
-PLAYER_2_PIECE = 2
-WINDOW_LENGTH = 4
+import gameRecords
+import moveServer
+import connect4Core
+from connect4Core import (ROW_COUNT, COLUMN_COUNT, EMPTY, PLAYER_1_PIECE, PLAYER_2_PIECE,
+                          search, merge_stats, report_adjudication)
 
 # --- CONFIGURATION ---
 # Lower depth = faster tournament.
 # Depth 2 is fast (seconds). Depth 4 is standard (minutes).
 TOURNAMENT_DEPTH = 2
 GAMES_PER_MATCHUP = 10  # How many times each pair plays (for statistical significance)
+GAME_LOG = "tournament_games.c4log"  # Every game played is appended here (see gameRecords.py), None to disable
+MOVE_SERVER = None  # (host, port) of a running moveServer.py to ask instead of searching in-process
+
+# --- ADJUDICATION ---
+# Stop a game as soon as a search proves a forced win or a draw, instead of playing it out
+ADJUDICATE = True
+VERIFY_ADJUDICATION = False  # Play adjudicated games out anyway to check the verdict and measure the saving
+adjudication_stats = {}  # Summed over every game played (see connect4Core.play_game)
+
+# --- SWISS SYSTEM ---
+# For large pools: each round pairs bots with similar scores, so ratings converge
+# in O(log n) rounds instead of the n - 1 a round robin needs.
+SWISS_GAMES_PER_PAIRING = 2
+SWISS_MAX_ROUNDS = None  # None = 2 * ceil(log2(n))
+SWISS_STABLE_ROUNDS = 2  # Stop once the top k has only changed by ties at the cutoff for this many rounds
+SWISS_TIE_MARGIN = 25  # Rating points from the top-k cutoff within which bots count as tied with it
+TOP_K = 10
+
+# --- RATINGS (Glicko-1, updated after every game) ---
+INITIAL_RATING = 1500
+INITIAL_RD = 350  # Rating deviation: 1 standard error of the rating
+MIN_RD = 30
+GLICKO_Q = math.log(10) / 400
 
 
 class Bot:
@@ -26,201 +47,97 @@ class Bot:
         self.wins = 0
         self.losses = 0
         self.draws = 0
-
-
-# --- GAME ENGINE (HEADLESS) ---
-def create_board():
-    return np.zeros((ROW_COUNT, COLUMN_COUNT))
-
-
-def drop_piece(board, row, col, piece):
-    board[row][col] = piece
-
-
-def is_valid_location(board, col):
-    return board[ROW_COUNT - 1][col] == 0
-
-
-def get_next_open_row(board, col):
-    for r in range(ROW_COUNT):
-        if board[r][col] == 0:
-            return r
-
-
-def winning_move(board, piece):
-    # Check horizontal
-    for c in range(COLUMN_COUNT - 3):
-        for r in range(ROW_COUNT):
-            if board[r][c] == piece and board[r][c + 1] == piece and board[r][c + 2] == piece and board[r][
-                c + 3] == piece:
-                return True
-    # Check vertical
-    for c in range(COLUMN_COUNT):
-        for r in range(ROW_COUNT - 3):
-            if board[r][c] == piece and board[r + 1][c] == piece and board[r + 2][c] == piece and board[r + 3][
-                c] == piece:
-                return True
-    # Check diagonals
-    for c in range(COLUMN_COUNT - 3):
-        for r in range(ROW_COUNT - 3):
-            if board[r][c] == piece and board[r + 1][c + 1] == piece and board[r + 2][c + 2] == piece and board[r + 3][
-                c + 3] == piece:
-                return True
-    for c in range(COLUMN_COUNT - 3):
-        for r in range(3, ROW_COUNT):
-            if board[r][c] == piece and board[r - 1][c + 1] == piece and board[r - 2][c + 2] == piece and board[r - 3][
-                c + 3] == piece:
-                return True
-    return False
-
-
-def is_terminal_node(board):
-    return winning_move(board, PLAYER_1_PIECE) or winning_move(board, PLAYER_2_PIECE) or len(
-        get_valid_locations(board)) == 0
-
-
-def get_valid_locations(board):
-    valid_locations = []
-    for col in range(COLUMN_COUNT):
-        if is_valid_location(board, col):
-            valid_locations.append(col)
-    return valid_locations
-
-
-# --- DYNAMIC AI ENGINE ---
-def evaluate_window(window, piece, weights):
-    score = 0
-    opp_piece = PLAYER_1_PIECE
-    if piece == PLAYER_1_PIECE:
-        opp_piece = PLAYER_2_PIECE
-
-    # Use the passed 'weights' dictionary
-    if window.count(piece) == 4:
-        score += weights['W_WIN']
-    elif window.count(piece) == 3 and window.count(EMPTY) == 1:
-        score += weights['W_THREE']
-    elif window.count(piece) == 2 and window.count(EMPTY) == 2:
-        score += weights['W_TWO']
-
-    if window.count(opp_piece) == 3 and window.count(EMPTY) == 1:
-        score -= weights['W_BLOCK']
-
-    return score
-
-
-def score_position(board, piece, weights):
-    score = 0
-
-    # Center Column
-    center_array = [int(i) for i in list(board[:, COLUMN_COUNT // 2])]
-    center_count = center_array.count(piece)
-    score += center_count * weights['W_CENTER']
-
-    # Horizontal
-    for r in range(ROW_COUNT):
-        row_array = [int(i) for i in list(board[r, :])]
-        for c in range(COLUMN_COUNT - 3):
-            window = row_array[c:c + WINDOW_LENGTH]
-            score += evaluate_window(window, piece, weights)
-
-    # Vertical
-    for c in range(COLUMN_COUNT):
-        col_array = [int(i) for i in list(board[:, c])]
-        for r in range(ROW_COUNT - 3):
-            window = col_array[r:r + WINDOW_LENGTH]
-            score += evaluate_window(window, piece, weights)
-
-    # Diagonals
-    for r in range(ROW_COUNT - 3):
-        for c in range(COLUMN_COUNT - 3):
-            window = [board[r + i][c + i] for i in range(WINDOW_LENGTH)]
-            score += evaluate_window(window, piece, weights)
-    for r in range(ROW_COUNT - 3):
-        for c in range(COLUMN_COUNT - 3):
-            window = [board[r + 3 - i][c + i] for i in range(WINDOW_LENGTH)]
-            score += evaluate_window(window, piece, weights)
-
-    return score
-
-
-def minimax(board, depth, alpha, beta, maximizingPlayer, piece, weights):
-    valid_locations = get_valid_locations(board)
-    is_terminal = is_terminal_node(board)
-
-    # Identify Opponent Piece
-    opp_piece = PLAYER_1_PIECE if piece == PLAYER_2_PIECE else PLAYER_2_PIECE
-
-    if depth == 0 or is_terminal:
-        if is_terminal:
-            if winning_move(board, piece):
-                return (None, 10000000)
-            elif winning_move(board, opp_piece):
-                return (None, -10000000)
-            else:
-                return (None, 0)
-        else:
-            return (None, score_position(board, piece, weights))
-
-    if maximizingPlayer:
-        value = -np.inf
-        column = random.choice(valid_locations)
-        for col in valid_locations:
-            row = get_next_open_row(board, col)
-            b_copy = board.copy()
-            drop_piece(b_copy, row, col, piece)
-            new_score = minimax(b_copy, depth - 1, alpha, beta, False, piece, weights)[1]
-            if new_score > value:
-                value = new_score
-                column = col
-            alpha = max(alpha, value)
-            if alpha >= beta: break
-        return column, value
+        self.rating = INITIAL_RATING
+        self.rd = INITIAL_RD
+        self.opponents = set()  # Names already paired with (Swiss)
+        self.byes = 0
+
+    def interval(self, z=1.96):
+        """Confidence interval of the rating (95% by default)."""
+        return self.rating - z * self.rd, self.rating + z * self.rd
+
+    def expected_score(self, other):
+        return 1 / (1 + 10 ** (-glicko_g(other.rd) * (self.rating - other.rating) / 400))
+
+
+def glicko_g(rd):
+    return 1 / math.sqrt(1 + 3 * (GLICKO_Q * rd / math.pi) ** 2)
+
+
+def update_ratings(b1, b2, s1):
+    """Glicko-1 update of both bots after one game, s1 being b1's result (1, 0.5 or 0)."""
+    new = []
+    for bot, opp, score in ((b1, b2, s1), (b2, b1, 1 - s1)):
+        g = glicko_g(opp.rd)
+        e = bot.expected_score(opp)
+        d2_inv = GLICKO_Q ** 2 * g ** 2 * e * (1 - e)
+        denom = 1 / bot.rd ** 2 + d2_inv
+        new.append((bot.rating + GLICKO_Q / denom * g * (score - e), max(MIN_RD, math.sqrt(1 / denom))))
+    (b1.rating, b1.rd), (b2.rating, b2.rd) = new
+
+
+def record_result(b1, b2, winner):
+    if winner == b1.name:
+        b1.wins += 1
+        b1.points += 1
+        b2.losses += 1
+        s1 = 1
+    elif winner == b2.name:
+        b2.wins += 1
+        b2.points += 1
+        b1.losses += 1
+        s1 = 0
     else:
-        value = np.inf
-        column = random.choice(valid_locations)
-        for col in valid_locations:
-            row = get_next_open_row(board, col)
-            b_copy = board.copy()
-            drop_piece(b_copy, row, col, opp_piece)
-            new_score = minimax(b_copy, depth - 1, alpha, beta, True, piece, weights)[1]
-            if new_score < value:
-                value = new_score
-                column = col
-            beta = min(beta, value)
-            if alpha >= beta: break
-        return column, value
+        b1.draws += 1
+        b2.draws += 1
+        b1.points += 0.5
+        b2.points += 0.5
+        s1 = 0.5
+    update_ratings(b1, b2, s1)
 
 
 # --- TOURNAMENT LOGIC ---
-def play_game(bot1, bot2):
-    board = create_board()
-    game_over = False
-    turn = random.randint(0, 1)  # Randomize who goes first
-
-    while not game_over:
-        if len(get_valid_locations(board)) == 0:
-            return "DRAW"
-
-        if turn == 0:  # Bot 1
-            col, score = minimax(board, TOURNAMENT_DEPTH, -np.inf, np.inf, True, PLAYER_1_PIECE, bot1.weights)
-            if col is None: return "DRAW"
-            row = get_next_open_row(board, col)
-            drop_piece(board, row, col, PLAYER_1_PIECE)
-            if winning_move(board, PLAYER_1_PIECE): return bot1.name
-            turn = 1
-
-        else:  # Bot 2
-            col, score = minimax(board, TOURNAMENT_DEPTH, -np.inf, np.inf, True, PLAYER_2_PIECE, bot2.weights)
-            if col is None: return "DRAW"
-            row = get_next_open_row(board, col)
-            drop_piece(board, row, col, PLAYER_2_PIECE)
-            if winning_move(board, PLAYER_2_PIECE): return bot2.name
-            turn = 0
-
-
-def run_tournament():
+move_client = None
+
+
+def choose_move(board, piece, weights):
+    global move_client
+    if MOVE_SERVER is None:
+        return search(board, TOURNAMENT_DEPTH, piece, weights)
+    if move_client is None:
+        move_client = moveServer.MoveClient(*MOVE_SERVER)
+    return move_client.best_move(board, piece, weights, TOURNAMENT_DEPTH)
+
+
+def play_game(bot1, bot2, game_log=None, turn=None):
+    seed = random.getrandbits(32)  # Recorded so the game can be replayed exactly
+    if turn is None:
+        turn = random.Random(seed).randint(0, 1)  # Randomize who goes first
+    names = {PLAYER_1_PIECE: bot1.name, PLAYER_2_PIECE: bot2.name, EMPTY: "DRAW"}
+    weights = {PLAYER_1_PIECE: bot1.weights, PLAYER_2_PIECE: bot2.weights}
+    first_piece = PLAYER_1_PIECE if turn == 0 else PLAYER_2_PIECE
+    result, stats, moves = connect4Core.play_game(weights, TOURNAMENT_DEPTH, first_piece, move_fn=choose_move,
+                                                  adjudicate_games=ADJUDICATE, verify=VERIFY_ADJUDICATION)
+    merge_stats(adjudication_stats, stats)
+    record_game(game_log, moves, first_piece, weights, seed, result,
+                adjudicated=stats['adjudicated'] and not VERIFY_ADJUDICATION)
+    return names[result]
+
+
+def record_game(game_log, moves, first_piece, weights, seed, result, adjudicated=False):
+    if game_log is None:
+        return
+    second_piece = PLAYER_1_PIECE if first_piece == PLAYER_2_PIECE else PLAYER_2_PIECE
+    # Records count the first mover as player 1
+    outcome = 0 if result == EMPTY else (1 if result == first_piece else 2)
+    game_log.append(gameRecords.encode_game(moves, gameRecords.weights_id(weights[first_piece]),
+                                            gameRecords.weights_id(weights[second_piece]),
+                                            TOURNAMENT_DEPTH, seed, outcome, adjudicated))
+
+
+def default_bots():
     # 1. DEFINE YOUR CONTESTANTS
-    bots = [
+    return [
         Bot("Balanced", {'W_CENTER': 3, 'W_WIN': 100, 'W_THREE': 5, 'W_TWO': 2, 'W_BLOCK': 4}),
         Bot("Aggressive", {'W_CENTER': 3, 'W_WIN': 100, 'W_THREE': 10, 'W_TWO': 5, 'W_BLOCK': 1}),  # High offense
         Bot("Defensive", {'W_CENTER': 3, 'W_WIN': 100, 'W_THREE': 2, 'W_TWO': 1, 'W_BLOCK': 100}),  # High defense
@@ -229,8 +146,15 @@ def run_tournament():
         # Doesn't care about center
     ]
 
+
+def run_tournament(bots=None):
+    if bots is None:
+        bots = default_bots()
+
     print(f"--- STARTING TOURNAMENT ({GAMES_PER_MATCHUP} games per matchup) ---")
 
+    game_log = gameRecords.GameLog(GAME_LOG, ROW_COUNT, COLUMN_COUNT) if GAME_LOG else None
+
     # Round Robin
     for i in range(len(bots)):
         for j in range(i + 1, len(bots)):
@@ -239,30 +163,150 @@ def run_tournament():
             print(f"Matchup: {b1.name} vs {b2.name}...", end="")
 
             for _ in range(GAMES_PER_MATCHUP):
-                winner = play_game(b1, b2)
-                if winner == b1.name:
-                    b1.wins += 1
-                    b1.points += 1
-                    b2.losses += 1
-                elif winner == b2.name:
-                    b2.wins += 1
-                    b2.points += 1
-                    b1.losses += 1
-                else:
-                    b1.draws += 1
-                    b2.draws += 1
-                    b1.points += 0.5
-                    b2.points += 0.5
+                winner = play_game(b1, b2, game_log)
+                record_result(b1, b2, winner)
             print(" Done.")
 
+    if game_log is not None:
+        game_log.close()
+
     # Results
-    print("\n--- FINAL STANDINGS ---")
     bots.sort(key=lambda x: x.points, reverse=True)
-    print(f"{'BOT NAME':<15} {'POINTS':<8} {'WINS':<6} {'LOSS':<6} {'DRAWS':<6}")
-    print("-" * 50)
+    print_standings(bots)
+
+
+def print_standings(bots):
+    print("\n--- FINAL STANDINGS ---")
+    print(f"{'BOT NAME':<15} {'POINTS':<8} {'WINS':<6} {'LOSS':<6} {'DRAWS':<6} {'RATING':<7} {'95% CI':<12}")
+    print("-" * 64)
     for b in bots:
-        print(f"{b.name:<15} {b.points:<8} {b.wins:<6} {b.losses:<6} {b.draws:<6}")
+        low, high = b.interval()
+        print(f"{b.name:<15} {b.points:<8} {b.wins:<6} {b.losses:<6} {b.draws:<6} {b.rating:<7.0f} "
+              f"{low:.0f}-{high:.0f}")
+    print()
+    if ADJUDICATE:
+        report_adjudication(adjudication_stats, VERIFY_ADJUDICATION)
+
+
+# --- SWISS TOURNAMENT ---
+def swiss_pairings(bots):
+    """
+    Pairs bots with equal or close scores, avoiding rematches where possible.
+    With an odd number of bots the lowest one without a bye sits out.
+    Returns: (pairs, bot with the bye or None)
+    """
+    standings = sorted(bots, key=lambda b: (b.points, b.rating), reverse=True)
+    bye = None
+    if len(standings) % 2:
+        bye = min(reversed(standings), key=lambda b: b.byes)
+        standings.remove(bye)
+
+    pairs = []
+    unpaired = standings
+    while unpaired:
+        b1 = unpaired[0]
+        # Closest-ranked bot not met yet, or simply the closest if all have been met
+        b2 = next((b for b in unpaired[1:] if b.name not in b1.opponents), unpaired[1])
+        pairs.append((b1, b2))
+        unpaired = [b for b in unpaired[1:] if b is not b2]
+    return pairs, bye
+
+
+def top_k(bots, k):
+    return [b.name for b in sorted(bots, key=lambda b: b.rating, reverse=True)[:k]]
+
+
+def top_k_separated(bots, k):
+    """True once the k-th bot's confidence interval lies entirely above the (k+1)-th's."""
+    ranked = sorted(bots, key=lambda b: b.rating, reverse=True)
+    if k >= len(ranked):
+        return True
+    return ranked[k - 1].interval()[0] > ranked[k].interval()[1]
+
+
+def cutoff_churn(bots, k, previous):
+    """
+    Bots that moved into or out of the top k since 'previous' (a set of names), leaving out
+    those tied with the cutoff (within SWISS_TIE_MARGIN of it), whose side of it is a coin flip.
+    """
+    ranked = sorted(bots, key=lambda b: b.rating, reverse=True)
+    if k >= len(ranked):
+        return []
+    cutoff = (ranked[k - 1].rating + ranked[k].rating) / 2
+    current = {b.name for b in ranked[:k]}
+    return [b.name for b in ranked
+            if (b.name in current) != (b.name in previous) and abs(b.rating - cutoff) > SWISS_TIE_MARGIN]
+
+
+def run_swiss_tournament(bots, k=TOP_K):
+    """
+    Swiss-system tournament with Glicko ratings. Stops after SWISS_MAX_ROUNDS, or earlier
+    (after at least log2(n) rounds) once the top k are set apart from the rest by their
+    confidence intervals, or for SWISS_STABLE_ROUNDS rounds the only changes to the top k
+    have been bots tied at the cutoff (see cutoff_churn).
+    The order within the top k is left to the ratings: it shifts after every game.
+    """
+    n = len(bots)
+    min_rounds = math.ceil(math.log2(max(2, n)))
+    max_rounds = SWISS_MAX_ROUNDS or 2 * min_rounds
+    k = min(k, n)
+    print(f"--- STARTING SWISS TOURNAMENT ({n} bots, up to {max_rounds} rounds, "
+          f"{SWISS_GAMES_PER_PAIRING} games per pairing) ---")
+
+    game_log = gameRecords.GameLog(GAME_LOG, ROW_COUNT, COLUMN_COUNT) if GAME_LOG else None
+    games = 0
+    leaders = None
+    stable = 0
+    for round_no in range(1, max_rounds + 1):
+        pairs, bye = swiss_pairings(bots)
+        if bye is not None:
+            bye.points += 1
+            bye.byes += 1
+        for b1, b2 in pairs:
+            b1.opponents.add(b2.name)
+            b2.opponents.add(b1.name)
+            for g in range(SWISS_GAMES_PER_PAIRING):
+                # Games are deterministic once the first mover is known, so alternate it
+                record_result(b1, b2, play_game(b1, b2, game_log, turn=g % 2))
+                games += 1
+
+        settled = leaders is not None and not cutoff_churn(bots, k, leaders)
+        stable = stable + 1 if settled else 0
+        leaders = set(top_k(bots, k))
+        separated = top_k_separated(bots, k)
+        print(f"Round {round_no}: {games} games so far, top {k} settled for {stable} round(s)"
+              f"{', top ' + str(k) + ' separated from the rest' if separated else ''}")
+        if round_no >= min_rounds and (separated or stable >= SWISS_STABLE_ROUNDS):
+            if round_no < max_rounds:
+                print("Ranking is stable, stopping early.")
+            break
+
+    if game_log is not None:
+        game_log.close()
+
+    bots.sort(key=lambda b: b.rating, reverse=True)
+    print_standings(bots)
+    round_robin = n * (n - 1) // 2 * SWISS_GAMES_PER_PAIRING  # At the same games per pair
+    print(f"Top {k} after {games} games (a round robin would need {round_robin}):")
+    for i, b in enumerate(bots[:k]):
+        low, high = b.interval()
+        print(f"#{i + 1}: {b.name} {b.rating:.0f} ({low:.0f}-{high:.0f}) {b.weights}")
+    return bots[:k]
+
+
+def random_bots(count):
+    """A pool of bots with random weights, drawn from the same ranges as the GA's first generation."""
+    return [Bot(f"Random-{i}", {'W_CENTER': random.randint(0, 10), 'W_WIN': 100,
+                                'W_THREE': random.randint(1, 20), 'W_TWO': random.randint(1, 10),
+                                'W_BLOCK': random.randint(1, 100)})
+            for i in range(count)]
 
 
 if __name__ == "__main__":
-    run_tournament()
\ No newline at end of file
+    # python tournament.py             -> round robin of the hand-made bots
+    # python tournament.py swiss [N]   -> Swiss tournament of the hand-made bots plus N random ones
+    if len(sys.argv) > 1 and sys.argv[1] == "swiss":
+        extra = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+        run_swiss_tournament(default_bots() + random_bots(extra))
+    else:
+        run_tournament()
\ No newline at end of file
@@ -0,0 +1,194 @@
+import sys
+import time
+
+import numpy as np
+
+import GAtournament
+import gameRecords
+from connect4Core import WEIGHT_KEYS, WINDOW_LENGTH, get_geometry
+
+# --- SETTINGS ---
+# Offline alternative to the GA: fit the evaluation weights to positions labelled
+# with the final result of the game they came from, instead of playing new games.
+GAME_LOGS = ["ga_games.c4log", "tournament_games.c4log"]  # Used when no paths are given on the command line
+BATCH_SIZE = 65536  # Positions per vectorized feature batch
+
+TUNED_KEYS = ['W_CENTER', 'W_THREE', 'W_TWO', 'W_BLOCK']  # W_WIN only scores finished games, which search handles
+FIXED_WEIGHTS = {'W_WIN': 100}
+
+LOGISTIC_SCALE = 100  # Evaluation points per unit of log-odds
+LEARNING_RATE = 0.5
+STEPS = 2000
+L2 = 1e-4
+
+# --- VALIDATION ---
+GA_RESULT = {'W_CENTER': 3, 'W_WIN': 100, 'W_THREE': 1, 'W_TWO': 8, 'W_BLOCK': 29}  # Shipped in connect4Engine.py
+VALIDATION_DEPTHS = [2, 3, 4]  # Games are deterministic, so vary the depth rather than repeat them
+
+
+# --- FEATURES ---
+def position_features(boards, pieces, length=WINDOW_LENGTH):
+    """
+    Vectorized score_position: features such that score_position(board, piece, weights)
+    equals features @ [weights[k] for k in WEIGHT_KEYS].
+    boards: (N, rows, columns) array, pieces: scalar or (N,) array, length: pieces in a row to win
+    Returns: (N, len(WEIGHT_KEYS)) float array
+    """
+    n, rows, columns = boards.shape
+    flat = boards.reshape(n, rows * columns)
+    pieces = np.broadcast_to(np.asarray(pieces), (n,))[:, None]
+    opp_pieces = 3 - pieces
+
+    windows = flat[:, get_geometry(rows, columns, length).windows]  # (N, windows, length)
+    mine = np.count_nonzero(windows == pieces[:, :, None], axis=2)
+    theirs = np.count_nonzero(windows == opp_pieces[:, :, None], axis=2)
+    empty = length - mine - theirs
+
+    features = np.empty((n, len(WEIGHT_KEYS)))
+    features[:, 0] = np.count_nonzero(boards[:, :, columns // 2] == pieces, axis=1)
+    features[:, 1] = np.count_nonzero(mine == length, axis=1)
+    features[:, 2] = np.count_nonzero((mine == length - 1) & (empty == 1), axis=1)
+    features[:, 3] = np.count_nonzero((mine == length - 2) & (empty == 2), axis=1)
+    features[:, 4] = -np.count_nonzero((theirs == length - 1) & (empty == 1), axis=1)
+    return features
+
+
+def labelled_features(boards, pieces, labels, length=WINDOW_LENGTH):
+    """
+    Features for both sides of every position, since search scores leaves from either point of view.
+    labels: result for 'pieces' (1 win, 0.5 draw, 0 loss)
+    """
+    x = np.concatenate([position_features(boards, pieces, length), position_features(boards, 3 - pieces, length)])
+    y = np.concatenate([labels, 1 - labels])
+    return x, y
+
+
+def log_features(paths, max_positions=None):
+    """
+    Streams every position out of the game logs and turns them into features batch by batch,
+    so only the (small) feature matrix is ever held in memory. Logs may hold different geometries.
+    Returns: (features, labels)
+    """
+    xs, ys = [], []
+    boards, pieces, labels = [], [], []
+    count = 0
+
+    def flush(length):
+        x, y = labelled_features(np.array(boards), np.array(pieces), np.array(labels, dtype=float), length)
+        xs.append(x.astype(np.float32))
+        ys.append(y.astype(np.float32))
+        boards.clear()
+        pieces.clear()
+        labels.clear()
+
+    for path in paths:
+        length = gameRecords.read_geometry(path)[2]
+        for board, piece, _, game in gameRecords.iter_positions(path):
+            boards.append(board.copy())
+            pieces.append(piece)
+            labels.append(0.5 if game.result == 0 else float(game.result == piece))
+            count += 1
+            if len(boards) == BATCH_SIZE:
+                flush(length)
+            if max_positions is not None and count >= max_positions:
+                break
+        if boards:
+            flush(length)  # Batches never mix logs, whose board sizes may differ
+        if max_positions is not None and count >= max_positions:
+            break
+    if not xs:
+        return np.empty((0, len(WEIGHT_KEYS))), np.empty(0)
+    return np.concatenate(xs), np.concatenate(ys)
+
+
+def array_features(path):
+    """
+    Loads positions labelled by a solver from an .npz file with arrays
+    'boards' (N, rows, columns), 'pieces' (N,) and 'values' (N,) in {-1, 0, 1} for the piece to move.
+    """
+    # Each access to an .npz member reads it from disk again, so read every array once
+    with np.load(path) as data:
+        boards, pieces, values = data['boards'], data['pieces'], data['values']
+    labels = (np.asarray(values, dtype=float) + 1) / 2
+    features, ys = [], []
+    for start in range(0, len(labels), BATCH_SIZE):
+        end = start + BATCH_SIZE
+        x, y = labelled_features(boards[start:end], pieces[start:end], labels[start:end])
+        features.append(x)
+        ys.append(y)
+    return np.concatenate(features), np.concatenate(ys)
+
+
+# --- FITTING ---
+def fit_weights(features, labels, steps=STEPS, learning_rate=LEARNING_RATE):
+    """
+    Logistic regression of the result on the evaluation: P(win) = sigmoid(score / LOGISTIC_SCALE).
+    Full-batch gradient descent on standardized features, weights kept non-negative like the GA does.
+    Returns: (weights dict, final loss)
+    """
+    cols = [WEIGHT_KEYS.index(k) for k in TUNED_KEYS]
+    x = features[:, cols].astype(float)
+    mean = x.mean(axis=0)
+    std = x.std(axis=0)
+    std[std == 0] = 1
+    z = (x - mean) / std
+    theta = np.zeros(len(cols))
+    bias = 0.0
+
+    for _ in range(steps):
+        p = 1 / (1 + np.exp(-(z @ theta + bias)))
+        error = p - labels
+        theta -= learning_rate * (z.T @ error / len(labels) + L2 * theta)
+        bias -= learning_rate * error.mean()
+        # W_BLOCK is applied to a negative count, so every tuned weight should be >= 0
+        theta = np.maximum(theta, 0)
+    p = np.clip(1 / (1 + np.exp(-(z @ theta + bias))), 1e-12, 1 - 1e-12)
+    loss = -np.mean(labels * np.log(p) + (1 - labels) * np.log(1 - p))
+
+    weights = dict(FIXED_WEIGHTS)
+    for key, value in zip(TUNED_KEYS, theta / std * LOGISTIC_SCALE):
+        weights[key] = round(float(value), 2)
+    return {k: weights[k] for k in WEIGHT_KEYS}, loss
+
+
+# --- VALIDATION ---
+def validate(weights, opponent=GA_RESULT, depths=VALIDATION_DEPTHS):
+    """
+    Short match between the tuned weights and the GA result: one GA match
+    (a game with each side moving first) per depth.
+    Returns: (tuned score, opponent score)
+    """
+    search_depth = GAtournament.SEARCH_DEPTH
+    tuned_score = opponent_score = 0
+    try:
+        for depth in depths:
+            GAtournament.SEARCH_DEPTH = depth
+            (_, s1), (_, s2), _, _ = GAtournament.play_match(({'id': 0, 'weights': weights},
+                                                              {'id': 1, 'weights': opponent}))
+            tuned_score += s1
+            opponent_score += s2
+    finally:
+        GAtournament.SEARCH_DEPTH = search_depth
+    return tuned_score, opponent_score
+
+
+if __name__ == "__main__":
+    paths = sys.argv[1:] or GAME_LOGS
+
+    start = time.perf_counter()
+    if len(paths) == 1 and paths[0].endswith('.npz'):
+        features, labels = array_features(paths[0])
+    else:
+        features, labels = log_features(paths)
+    print(f"Features: {len(labels)} samples in {time.perf_counter() - start:.1f}s")
+    if len(labels) == 0:
+        sys.exit("No positions found")
+
+    start = time.perf_counter()
+    weights, loss = fit_weights(features, labels)
+    print(f"Fit: log-loss {loss:.4f} in {time.perf_counter() - start:.1f}s")
+    print(f"Tuned weights: {weights}")
+
+    print(f"\nValidating against the GA result {GA_RESULT} at depths {VALIDATION_DEPTHS}...")
+    tuned_score, ga_score = validate(weights)
+    print(f"Tuned {tuned_score} - {ga_score} GA")
@@ -0,0 +1,288 @@
+import collections
+import importlib
+import multiprocessing
+import os
+import socket
+import sys
+import threading
+import time
+import traceback
+from multiprocessing.managers import BaseManager
+
+# --- SETTINGS ---
+# Spreads jobs (GA matches) over worker processes on any number of hosts.
+# The coordinator is the GA driver with WORK_QUEUE set (see GAtournament.py). On every
+# worker host run: python workQueue.py <coordinator host> [port] [processes]
+# Connections carry pickles, which can run code, so both sides must share a secret key:
+# set it in AUTHKEY_ENV (e.g. export C4_WORK_QUEUE_KEY=$(openssl rand -hex 32)) on every host.
+PORT = 5005
+AUTHKEY_ENV = "C4_WORK_QUEUE_KEY"
+HEARTBEAT = 2.0  # Seconds between a worker's "still alive" messages
+WORKER_TIMEOUT = 10.0  # A worker silent this long is presumed dead and its jobs are handed out again
+RECONNECT_DELAY = 2.0  # Seconds a worker waits before trying an unreachable coordinator again
+
+
+def authkey_from_env():
+    """The shared secret from AUTHKEY_ENV. Raises ValueError if it is not set."""
+    key = os.environ.get(AUTHKEY_ENV)
+    if not key:
+        raise ValueError(f"Set {AUTHKEY_ENV} to the same secret on the coordinator and every worker host")
+    return key.encode()
+
+
+def function_name(function):
+    """
+    (module, name) a worker can import 'function' by. Functions defined in the script
+    being run live in '__main__', which workers know by the script's file name.
+    """
+    module = function.__module__
+    if module == '__main__':
+        module = os.path.splitext(os.path.basename(sys.modules['__main__'].__file__))[0]
+    return module, function.__qualname__
+
+
+# --- COORDINATOR ---
+class JobQueue:
+    """
+    Pending jobs, the jobs each worker holds, and finished results.
+    Lives in the coordinator; workers call it through a manager proxy.
+    """
+
+    def __init__(self, settings=None):
+        self.settings = settings or {}  # module -> {name: value} applied by workers before their first job
+        self.pending = collections.deque()  # (job id, (module, name), args)
+        self.leases = {}  # job id -> (worker, job)
+        self.results = {}  # job id -> (ok, result or traceback)
+        self.last_seen = {}  # worker -> time of its last message
+        self.next_id = 0
+        self.counters = {'jobs': 0, 'retried': 0, 'duplicates': 0, 'workers': 0}
+        self.lock = threading.Condition()  # Reentrant, so collect() can requeue while holding it
+
+    # Called by workers
+    def get_settings(self):
+        return self.settings
+
+    def heartbeat(self, worker):
+        with self.lock:
+            if worker not in self.last_seen:
+                self.counters['workers'] += 1
+            self.last_seen[worker] = time.monotonic()
+
+    def take(self, worker, timeout):
+        """Waits up to 'timeout' seconds for a job. Returns: (job id, (module, name), args) or None"""
+        self.heartbeat(worker)
+        with self.lock:
+            if not self.pending:
+                self.lock.wait(timeout)
+            if not self.pending:
+                return None
+            job = self.pending.popleft()
+            self.leases[job[0]] = (worker, job)
+            return job
+
+    def finish(self, worker, job_id, ok, result):
+        self.heartbeat(worker)
+        with self.lock:
+            if self.leases.pop(job_id, None) is None:
+                # The job was handed out again after this worker went quiet: first result wins
+                pending = collections.deque(job for job in self.pending if job[0] != job_id)
+                if len(pending) == len(self.pending):
+                    self.counters['duplicates'] += 1
+                    return
+                self.pending = pending
+            self.results[job_id] = (ok, result)
+            self.lock.notify_all()
+
+    # Called by the coordinator
+    def submit(self, function, jobs):
+        """
+        Queues function(args) for every args in 'jobs'.
+        function: (module, name) as given by function_name
+        Returns: their job ids
+        """
+        with self.lock:
+            ids = list(range(self.next_id, self.next_id + len(jobs)))
+            self.next_id += len(jobs)
+            self.pending.extend((job_id, function, args) for job_id, args in zip(ids, jobs))
+            self.counters['jobs'] += len(jobs)
+            self.lock.notify_all()
+        return ids
+
+    def requeue_lost(self):
+        """Hands out again every job held by a worker that has gone quiet for WORKER_TIMEOUT."""
+        now = time.monotonic()
+        with self.lock:
+            lost = [job_id for job_id, (worker, _) in self.leases.items()
+                    if now - self.last_seen.get(worker, 0) > WORKER_TIMEOUT]
+            for job_id in lost:
+                _, job = self.leases.pop(job_id)
+                self.pending.appendleft(job)
+                self.counters['retried'] += 1
+            if lost:
+                self.lock.notify_all()
+
+    def collect(self, ids):
+        """Blocks until every job in 'ids' has finished. Returns: results in the same order"""
+        with self.lock:
+            while True:
+                remaining = [job_id for job_id in ids if job_id not in self.results]
+                if not remaining:
+                    break
+                self.lock.wait(HEARTBEAT)
+                self.requeue_lost()
+            results = [self.results.pop(job_id) for job_id in ids]
+        for ok, result in results:
+            if not ok:
+                raise RuntimeError(f"Job failed on a worker:\n{result}")
+        return [result for _, result in results]
+
+    def active_workers(self):
+        now = time.monotonic()
+        with self.lock:
+            return sum(now - seen <= WORKER_TIMEOUT for seen in self.last_seen.values())
+
+    def stats(self):
+        with self.lock:
+            stats = dict(self.counters)
+            stats['pending'] = len(self.pending)
+            stats['held'] = len(self.leases)
+        stats['active_workers'] = self.active_workers()
+        return stats
+
+
+class CoordinatorManager(BaseManager):
+    pass
+
+
+class WorkerManager(BaseManager):
+    pass
+
+
+job_queue = None  # The JobQueue, in the manager's server process
+
+
+def init_queue(settings):
+    global job_queue
+    job_queue = JobQueue(settings)
+
+
+def get_queue():
+    return job_queue
+
+
+CoordinatorManager.register('get_queue', callable=get_queue)
+WorkerManager.register('get_queue')
+
+
+class Coordinator:
+    """
+    Starts a manager process serving a JobQueue on 'address' for workers to pull from.
+    Only clients that know 'authkey' can connect. Bind to a trusted interface: ('', port) is every one.
+    map() is a drop-in for multiprocessing.Pool.map, so the GA driver can use either.
+    """
+
+    def __init__(self, address, authkey, settings=None):
+        self.manager = CoordinatorManager(address=address, authkey=authkey)
+        self.manager.start(init_queue, (settings,))
+        self.address = self.manager.address
+        self.queue = self.manager.get_queue()
+
+    def map(self, function, jobs):
+        return self.queue.collect(self.queue.submit(function_name(function), list(jobs)))
+
+    def stats(self):
+        return self.queue.stats()
+
+    def close(self):
+        # Workers see the connection drop and go back to waiting for the next coordinator
+        self.manager.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# --- WORKER ---
+def apply_settings(settings):
+    for module, values in settings.items():
+        module = importlib.import_module(module)
+        for name, value in values.items():
+            setattr(module, name, value)
+
+
+def serve_jobs(address, authkey, name=None):
+    """
+    Pulls and runs jobs from the coordinator at 'address' until the connection drops.
+    Returns: jobs completed
+    """
+    name = name or f"{socket.gethostname()}:{os.getpid()}"
+    manager = WorkerManager(address=address, authkey=authkey)
+    manager.connect()
+    jobs = manager.get_queue()
+    apply_settings(jobs.get_settings())
+    functions = {}
+    done = 0
+
+    # Heartbeats come from their own thread (and connection), so long jobs don't look like dead workers
+    stopped = threading.Event()
+
+    def beat():
+        while not stopped.wait(HEARTBEAT):
+            try:
+                jobs.heartbeat(name)
+            except (OSError, EOFError):
+                return
+
+    threading.Thread(target=beat, daemon=True).start()
+    try:
+        while True:
+            job = jobs.take(name, HEARTBEAT)
+            if job is None:
+                continue
+            job_id, function, args = job
+            if function not in functions:
+                module, qualname = function
+                functions[function] = getattr(importlib.import_module(module), qualname)
+            try:
+                ok, result = True, functions[function](args)
+            except Exception:
+                ok, result = False, traceback.format_exc()
+            jobs.finish(name, job_id, ok, result)
+            done += 1
+    except (OSError, EOFError):
+        return done
+    finally:
+        stopped.set()
+
+
+def run_worker(address, authkey):
+    """Serves jobs forever, reconnecting whenever the coordinator goes away (e.g. between GA runs)."""
+    while True:
+        try:
+            serve_jobs(address, authkey)
+        except (OSError, EOFError):
+            pass
+        time.sleep(RECONNECT_DELAY)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit("Usage: python workQueue.py <coordinator host> [port] [processes]")
+    try:
+        authkey = authkey_from_env()
+    except ValueError as e:
+        sys.exit(str(e))
+    address = (sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else PORT)
+    processes = int(sys.argv[3]) if len(sys.argv) > 3 else multiprocessing.cpu_count()
+    print(f"Starting {processes} workers for {address[0]}:{address[1]}")
+    workers = [multiprocessing.Process(target=run_worker, args=(address, authkey)) for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.terminate()